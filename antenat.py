@@ -1,5 +1,10 @@
 import streamlit as st
 
+from omm.boundary import panel
+from omm.spec import load
+
+MODEL = load("antenat")
+
 st.set_page_config(
     page_title="Определение предотвратимости антенатальной смерти плода",
     page_icon="🩺",
@@ -23,11 +28,12 @@ expression126 = st.number_input(
 )
 
 if st.button("Расчет", use_container_width=True):
-    d = -6.941 * expression126 + 6.092
+    record = {"mir126": expression126}
+    res = MODEL.evaluate(record)
 
     st.markdown("---")
 
-    if d > 0:
+    if res.label == 1:
         st.success(
             "Антенатальная смерть плода на сроке доношенной беременности\n\n"
             "**была не предотвратима**"
@@ -37,3 +43,5 @@ if st.button("Расчет", use_container_width=True):
             "Антенатальная смерть плода на сроке доношенной беременности\n\n"
             "**была предотвратима**"
         )
+
+    panel(st, MODEL, record)
@@ -1,31 +1,24 @@
 import streamlit as st
 
-# ── Model constants ────────────────────────────────────────────────────────────
-COEF_AST = 0.168        # x1  Aspartate aminotransferase (AST)  (U/L)
-COEF_HDL = -3.944       # x2  HDL cholesterol (mmol/L)
-COEF_P12A = 2.917       # x3  PPARG P12A genotype
-COEF_SUPPORT = 13.215   # x4  Luteal support duration (>12w = 1)
-INTERCEPT = -10.050     # Const
+from omm.boundary import panel
+from omm.spec import load
+from omm.whatif import panel as whatif_panel
+
+# ── Model ──────────────────────────────────────────────────────────────────────
+MODEL = load("macrosomia")  # coefficients: omm/specs/macrosomia.json
 
 # ── Helper functions ──────────────────────────────────────────────────────────
 
 def compute_index(ast: float, hdl: float, genotype_code: int, support_code: int) -> float:
     """Return the prognostic index M using the published equation."""
-    return (
-        COEF_AST * ast
-        + COEF_HDL * hdl
-        + COEF_P12A * genotype_code
-        + COEF_SUPPORT * support_code
-        + INTERCEPT
-    )
+    return MODEL.evaluate(
+        {"ast": ast, "hdl": hdl, "pparg_p12a": genotype_code, "luteal_support": support_code}
+    ).index
 
 
 def classify_risk(m_value: float) -> str:
     """Convert M to a clinical interpretation."""
-    return (
-        "Высокий риск макросомии (M > 0)" if m_value > 0 else
-        "Риск макросомии не выявлен (M ≤ 0)"
-    )
+    return MODEL.labels[MODEL.classify(m_value)]
 
 # ── UI ─────────────────────────────────────────────────────────────────────────
 
@@ -77,10 +70,11 @@ if st.button("Рассчитать риск"):
     st.subheader("Результат")
     # st.metric(label="Индекс M", value=f"{m_value:.3f}")
     # st.write(f"**{risk_text}**")
-    if m_value > 0:
+    if MODEL.classify(m_value) == 1:
         st.error(risk_text)
     else:
         st.success(risk_text)
+    panel(st, MODEL, {"ast": ast, "hdl": hdl, "pparg_p12a": genotype, "luteal_support": support})
 
     # with st.expander("Подробнее о формуле"):
     #     st.code(
@@ -93,3 +87,6 @@ if st.button("Рассчитать риск"):
     #         "- **Genotype**: 0=C/C, 1=C/G, 2=G/G;\n"
     #         "- **Support**: 0 — ≤12 недель, 1 — >12 недель." )
 
+# AST × HDL sensitivity map, the genotype and support as selected above
+whatif_panel(st, MODEL, "ast", "hdl", {"ast": ast, "hdl": hdl, "pparg_p12a": genotype, "luteal_support": support},
+             (0.0, 150.0), (0.0, 3.0), key="macrosomia_whatif")
@@ -2,9 +2,17 @@ import streamlit as st
 import numpy as np
 import joblib
 
+from omm.cache import PREDICTIONS, model_version
+
 groups = ['Высокий риск рецидива эндометриоза', 'Низкий риск рецидива эндометриоза']
 
-model = joblib.load("model_1.joblib")
+
+@st.cache_resource
+def load_model():
+    return joblib.load("model_1.joblib")
+
+
+model = load_model()
 
 st.title("ОММ ENDOMETRIOSIS RECURRENCE")
 
@@ -26,18 +34,21 @@ boolean_features = [
     'Жалобы на боль в животе'
 ]
 
-input_values = []
+input_values = {}
 for feature_name in feature_list:
     if feature_name in boolean_features:
         checked = st.checkbox(feature_name, value=False)
-        input_values.append(int(checked))
+        input_values[feature_name] = int(checked)
     else:
         numeric_val = st.number_input(feature_name, value=0.0)
-        input_values.append(numeric_val)
+        input_values[feature_name] = numeric_val
 
 if st.button("Рассчёт"):
-    X_new = np.array([input_values])
-    predicted_group = model.predict(X_new)[0]
+    # columns in the order the model was fitted with, not the display order
+    X_new = np.array([[input_values[name] for name in model.feature_names_in_]])
+    # identical inputs (reruns, re-submits) are answered from the process-wide cache
+    predicted_group = PREDICTIONS.get_or_compute(model_version("model_1.joblib"), X_new,
+                                                 lambda: model.predict(X_new)[0])
     style = result_styles.get(predicted_group, "")
     result_html = f'<div style="{style}">{groups[predicted_group]}</div>'
     st.markdown(result_html, unsafe_allow_html=True)
@@ -1,5 +1,10 @@
 import streamlit as st
 
+from omm.boundary import panel
+from omm.spec import load
+
+MODEL = load("fetal")
+
 st.set_page_config(
     page_title="ГСД — риск ЗРП",
     page_icon="🩺",
@@ -29,17 +34,20 @@ with st.form("risk_form"):
     submitted = st.form_submit_button("Рассчитать риск")
 
 if submitted:
-    # map selections to 0 / 1
-    x1_val = 1 if x1 == "Есть" else 0
-    x3_val = 1 if x3 == "Есть" else 0
-
-    P = 27.4 * x1_val - 0.31 * x2 + 0.48 * x3_val + 1.6
+    record = {
+        "uteroplacental_flow": int(x1 == "Есть"),
+        "vegf_a": x2,
+        "enos_g894t": int(x3 == "Есть"),
+    }
+    res = MODEL.evaluate(record)
+    P = res.index
     st.markdown(f"### Индекс **P** = `{P:.2f}`")
 
-    if P > 0.49:
+    if res.label == 1:
         st.error("Высокий риск задержки роста плода")
     else:
         st.success("Низкий риск задержки роста плода")
+    panel(st, MODEL, record)
 
     # st.caption(
     #     "При расчёте используются значения из публикации: "
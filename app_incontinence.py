@@ -1,5 +1,10 @@
 import streamlit as st
 
+from omm.spec import load
+
+SLING = load("incontinence_sling")
+GEL = load("incontinence_gel")
+
 # ---------- helpers ---------- #
 def get_float(label, placeholder, *, min_v, max_v):
     """
@@ -70,22 +75,20 @@ def main():
             st.warning("Пожалуйста, заполните все поля корретно.")
             return
 
-        result_setka = (
-            -7.9285 * diff_shirini
-            + 0.2587 * avg_speed
-            + 0.4650 * gg_esr
-            - 3.8844
-        )
-        result_gel = (
-            1.390  * dlina_uretri
-            - 0.3216 * max_speed
-            - 0.7385 * gg_col1a
-            + 6.184
-        )
+        result_setka = SLING.evaluate({
+            "urethra_width_diff_cm": diff_shirini,
+            "avg_flow": avg_speed,
+            "esr1_gg": gg_esr,
+        })
+        result_gel = GEL.evaluate({
+            "urethra_length": dlina_uretri,
+            "max_flow": max_speed,
+            "col1a1_gg": gg_col1a,
+        })
 
         st.write("## Результаты")
         # Setka recommendation
-        if result_setka > 0:
+        if result_setka.label == 1:
             st.markdown(
                 "**Уретропексия свободной синтетической петлёй + передняя кольпоррафия:** "
                 ":red[НЕ рекомендовано]"
@@ -97,7 +100,7 @@ def main():
             )
 
         # Gel recommendation
-        if result_gel > 0:
+        if result_gel.label == 1:
             st.markdown(
                 "**Парауретральное введение объёмообразующего геля + передняя кольпоррафия:** "
                 ":red[НЕ рекомендовано]"
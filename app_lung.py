@@ -1,5 +1,10 @@
 import streamlit as st
 
+from omm.spec import load
+from omm.whatif import panel as whatif_panel
+
+MODELS = [load("lung_1"), load("lung_2"), load("lung_3")]
+
 # ───────────────── helpers ──────────────────
 def num_input(label, *, key):
     raw = st.text_input(label, key=key, value="", placeholder="")
@@ -44,12 +49,9 @@ with col1:
         if None in (v_leuk, v_na):
             result1.warning("Пожалуйста, заполните все поля.")
         else:
-            score = -3.287 + 0.215 * v_leuk + 0.0321 * v_na
+            res = MODELS[0].evaluate({"tnf": v_leuk, "na": v_na})
             result1.markdown(
-                stage_badge(
-                    "Каналикулярная стадия" if score >= 0.5 else "Саккулярная стадия",
-                    bad=score >= 0.5,
-                ),
+                stage_badge(MODELS[0].labels[res.label], bad=res.label == 1),
                 unsafe_allow_html=True,
             )
 
@@ -68,12 +70,9 @@ with col2:
         if None in (v353, v172, v210, v344):
             result2.warning("Пожалуйста, заполните все поля.")
         else:
-            score = -30.649 + 0.1969 * v172 - 0.0258 * v210 + 0.0242 * v344 + 0.2189 * v353
+            res = MODELS[1].evaluate({"tnf": v353, "na": v172, "hematocrit": v210, "lung_density": v344})
             result2.markdown(
-                stage_badge(
-                    "Каналикулярная стадия" if score >= 0.68 else "Саккулярная стадия",
-                    bad=score >= 0.68,
-                ),
+                stage_badge(MODELS[1].labels[res.label], bad=res.label == 1),
                 unsafe_allow_html=True,
             )
 
@@ -91,11 +90,13 @@ with col3:
         if None in (v_tnf, v_nse, v_pkt):
             result3.warning("Пожалуйста, заполните все поля.")
         else:
-            score = -12.345 + 0.11 * v_tnf + 0.33 * v_nse + 0.42 * v_pkt
+            res = MODELS[2].evaluate({"tnf": v_tnf, "nse": v_nse, "pct": v_pkt})
             result3.markdown(
-                stage_badge(
-                    "Каналикулярная стадия" if score >= 0.6 else "Саккулярная стадия",
-                    bad=score >= 0.6,
-                ),
+                stage_badge(MODELS[2].labels[res.label], bad=res.label == 1),
                 unsafe_allow_html=True,
             )
+
+# ───────────── Model 1: Na⁺ × TNF sensitivity ─────────────
+st.divider()
+st.markdown("**Модель 1** — как заключение зависит от Na⁺ и TNF")
+whatif_panel(st, MODELS[0], "na", "tnf", {"tnf": v_leuk, "na": v_na}, (100.0, 160.0), (0.0, 20.0), key="lung1_whatif")
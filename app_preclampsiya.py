@@ -1,5 +1,9 @@
 import streamlit as st
 
+from omm.spec import load
+
+MODEL = load("preeclampsia_art")
+
 st.header("OMM PREECLAMPSIA IN GESTATIONAL MELLITUS AFTER ART")
 
 st.markdown("""
@@ -9,10 +13,7 @@ st.markdown("""
 # 1) Вид программы ВРТ (x1) — неизменяемый выбор
 program = st.selectbox(
     "1) Вид программы ВРТ:",
-    (
-        "Перенос эмбриона в цикле стимуляции суперовуляции",
-        "Перенос размороженного эмбриона (криоперенос)"
-    )
+    MODEL.inputs["art_program"]["options"],
 )
 
 # 2) ИМТ в I триместре (x2) — числовое поле
@@ -33,21 +34,16 @@ cvd = st.selectbox(
 # 4) Полиморфизм гена ApoB (x4)
 geno = st.selectbox(
     "4) Полиморфизм гена ApoBPro2739leuGgtA:",
-    ("Доминантный вариант (GG)", "Гетерозиготный вариант (GA)", "Рецессивный вариант (АА)")
+    MODEL.inputs["apob"]["options"],
 )
 
 # Button to run calculation
 if st.button("Calculate"):
-    # map inputs to x1–x4
-    x1 = 0 if program.startswith("Перенос эмбриона в цикле стимуляции суперовуляции") else 1
-    x3 = 1 if cvd == "Да" else 0
-    x4 = {"Доминантный вариант (GG)": 0, "Гетерозиготный вариант (GA)": 1, "Рецессивный вариант (АА)": 2}[geno]
-
-    # compute prognostic index D
-    D = -0.287 * x1 + 1.166 * x2 + 3.460 * x3 + 5.860 * x4 - 31.912
+    # compute prognostic index D (encodings of x1–x4 live in the spec)
+    res = MODEL.evaluate({"art_program": program, "bmi": x2, "cvd": int(cvd == "Да"), "apob": geno})
 
     # red background for high risk, green for low
-    if D >= 0:
+    if res.label == 1:
         st.error("⚠️ Высокий риск развития преэклампсии")
     else:
         st.success("✔️ Низкий (отсутствует) риск преэклампсии")
@@ -1,5 +1,10 @@
 import streamlit as st
 
+from omm.spec import load
+from omm.whatif import panel as whatif_panel
+
+MODEL = load("response")
+
 # ── helpers ──────────────────────────────────────────────────────────────
 def get_float(label, placeholder, *, min_v: float, max_v: float):
     """
@@ -64,17 +69,16 @@ if submitted:
     if None in (no2, no3, rodi, spaechniy, gisteroskopiya):
         st.warning("Пожалуйста, заполните все поля.")
     else:
-        score = (
-            0.542 * no2
-            + 0.154 * no3
-            - 4.125 * rodi
-            + 10.337 * spaechniy
-            - 8.762 * gisteroskopiya
-            - 4.637
-        )
+        res = MODEL.evaluate({
+            "no2": no2,
+            "no3": no3,
+            "parous": rodi,
+            "adhesions": spaechniy,
+            "hysteroscopy": gisteroskopiya,
+        })
 
         st.markdown("---")
-        if score < 0:
+        if res.label == 0:
             st.markdown(
                 "<h4 style='color:#dc3545'>Прогнозируется НЕВОЗМОЖНОСТЬ наступления беременности</h4>",
                 unsafe_allow_html=True,
@@ -84,3 +88,10 @@ if submitted:
                 "<h4 style='color:#198754'>Прогнозируется наступление беременности</h4>",
                 unsafe_allow_html=True,
             )
+
+# ── NO₂ × NO₃ sensitivity, the history answers as entered (unanswered = «Нет») ──
+whatif_panel(
+    st, MODEL, "no2", "no3",
+    {"no2": no2, "no3": no3, "parous": rodi or 0, "adhesions": spaechniy or 0, "hysteroscopy": gisteroskopiya or 0},
+    (0.0, 50.0), (0.0, 100.0), key="response_whatif",
+)
@@ -1,21 +1,20 @@
 # app.py
-import math
-import pandas as pd
 import streamlit as st
 
+from omm.boundary import panel
+from omm.spec import load, logistic
+
 st.set_page_config(page_title="Неонатальный риск (TTTS)", layout="centered")
 
 st.title("Оценка риска летального исхода (неонатальный период)")
 st.caption("Для недоношенных монохориальных диамниотических близнецов после фето-фетального трансфузионного синдрома (ФФТС)")
 
-THRESHOLD = 0.4  # порог P
+MODEL = load("ttts_risk")
+THRESHOLD = MODEL.thresholds[0]  # порог P
 
 def compute_di(x1:int, x2:int, x3:float, x4:float) -> float:
-    # DI = 2.679*X1 - 1.299*X2 + 0.218*X3 + 0.536*X4 - 19.669
-    return 2.679 * x1 - 1.299 * x2 + 0.218 * x3 + 0.536 * x4 - 19.669
-
-def logistic(di: float) -> float:
-    return 1.0 / (1.0 + math.exp(-di))
+    # DI = 2.679*X1 - 1.299*X2 + 0.218*X3 + 0.536*X4 - 19.669 (omm/specs/ttts_risk.json)
+    return MODEL.index([x1, x2, x3, x4])
 
 def classify(p: float, thr: float) -> str:
     return "Высокий риск" if p > thr else "Низкий риск"
@@ -107,6 +106,8 @@ if submitted:
             unsafe_allow_html=True,
         )
 
+        panel(st, MODEL, {"malperfusion": int(x1), "apgar10": int(x2), "chloride": float(x3), "lactate": float(x4)})
+
         with st.expander("Проверка используемых значений"):
             st.json(
                 {
@@ -1,5 +1,8 @@
 import streamlit as st
-import math
+
+from omm.spec import load
+
+MODEL = load("urodynamics")
 
 def get_float(label, placeholder, *, min_v, max_v):
     """Return a float or None, after basic validation."""
@@ -64,17 +67,15 @@ if st.button("Рассчитать риск"):
     if None in (ar_1, ar_2, ar_3, ar_4, ar_5, ar_6):
         st.warning("Пожалуйста, заполните все поля.")
     else:
-        num = math.exp(
-            13.189
-            - 1.314  * ar_1
-            - 5.4581 * ar_2
-            - 0.12576 * ar_3
-            + 2.9661 * ar_4
-            - 0.27877 * ar_5
-            - 0.16889 * ar_6
-        )
-        W = num / (1 + num)
-        if W >= 0.5:
+        res = MODEL.evaluate({
+            "first_birth": ar_1,
+            "urethra_width_diff_mm": ar_2,
+            "vaginal_pressure": ar_3,
+            "esr1_gg": ar_4,
+            "perineal_center": ar_5,
+            "bulbospongiosus": ar_6,
+        })
+        if res.label == 1:
             st.markdown(
                 "<h3 style='text-align:center;color:red;'>ВЫСОКИЙ РИСК</h3>"
                 "<h5 style='text-align:center;'>дисфункции тазового дна через 6 месяцев после родов</h5>",
@@ -3,7 +3,12 @@
 # Запуск: streamlit run app.py
 
 import streamlit as st
-import pandas as pd
+
+from omm.spec import load
+from omm.tables import table
+
+MODEL = load("sfgr_risk")
+TABLE = table("sfgr_risk")  # all 176 combinations, omm/tables/sfgr_risk.json
 
 st.set_page_config(
     page_title="Риск в неонатальном периоде (MCDA, sFGR)",
@@ -41,10 +46,11 @@ with col2:
 with st.form("calc_form"):
     submitted = st.form_submit_button("Рассчитать")
 
-THRESHOLD = 0.875
+THRESHOLD = MODEL.thresholds[0]
 
 def compute_di(x1, x2, x3, x4, x5):
-    return 19.5 * x1 + 19.2 * x2 - 2.2 * x3 + 25.0 * x4 + 15.7 * x5 - 0.81
+    return TABLE.evaluate({"co_twin_demise": x1, "prom": x2, "apgar1": x3,
+                           "acute_placental_insufficiency": x4, "intervillositis": x5}).index
 
 if submitted:
     di = compute_di(x1, x2, x3, x4, x5)
@@ -0,0 +1,6 @@
+"""Shared, importable core of the OMM calculators.
+
+The Streamlit scripts at the repository root are thin UI layers; everything
+that has to work outside a browser session (batch scoring, services, tools)
+lives in this package.
+"""
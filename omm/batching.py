@@ -0,0 +1,70 @@
+"""Micro-batching of concurrent single-row predictions.
+
+A single-row ``predict_proba`` on the forests is dominated by per-call
+overhead (input validation, per-estimator dispatch), not by the trees
+themselves.  :class:`MicroBatcher` collects rows submitted concurrently for
+at most ``max_wait_ms`` (or until ``max_batch_size`` rows are waiting), stacks
+them into one matrix, makes one ``predict`` call in a worker thread and hands
+each caller its own row of the result.
+"""
+import asyncio
+
+import numpy as np
+
+
+class MicroBatcher:
+    def __init__(self, predict, *, max_batch_size: int = 64, max_wait_ms: float = 2.0, executor=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._pending = []
+        self._timer = None
+        self._tasks = set()  # running batches; the loop keeps only weak references to tasks
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, row) -> np.ndarray:
+        """Predict one row; resolves with ``predict(rows)[i]`` for this row."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((np.asarray(row, dtype=np.float64), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        rows, futures = zip(*batch)
+        self.batches += 1
+        self.rows += len(rows)
+        try:
+            out = await asyncio.get_running_loop().run_in_executor(self.executor, self.predict, np.vstack(rows))
+        except Exception as e:
+            for f in futures:
+                if not f.done():
+                    f.set_exception(e)
+            return
+        for f, r in zip(futures, out):
+            if not f.done():
+                f.set_result(r)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,186 @@
+"""Performance benchmarks for every calculator.
+
+    python -m omm.bench --output bench.json                 # run and save
+    python -m omm.bench --compare bench.json                # run and compare
+    python -m omm.bench --only predict,load --repeat 20
+
+Metrics (one flat ``{name: value}`` dict, the unit is part of the name):
+
+* ``rerun_ms/<page>``            — median Streamlit rerun of each page (AppTest);
+* ``load_ms/<artifact>``         — median ``joblib.load`` of each model file
+  (sklearn already imported, so this is the artifact itself), or
+  ``omm.store.open_forest`` of each forest store;
+* ``single_us/<calculator>``     — one patient, formula and model calculators;
+* ``batch_ms/<calculator>``      — ``BATCH_ROWS`` patients in one call;
+* ``batch_peak_mb/<calculator>`` — traced peak allocation of that batch call;
+* ``rss_peak_mb``                — peak resident memory of the whole run.
+
+With ``--compare`` every metric is divided by its baseline value; ratios above
+``1 + tolerance`` are reported as regressions and the exit status is 1.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from omm import engine, models, store
+from omm.models import ROOT
+
+SECTIONS = ("rerun", "load", "predict")
+ARTIFACTS = ("model.joblib", "model_1.joblib", "data/models.pkl", "data/models_serving.pkl",
+             "vpch/model_surg.pkl", "vpch/model_obs.pkl")
+BATCH_ROWS = 1000
+
+
+def _median_time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return statistics.median(times)
+
+
+def random_records(spec, n: int, rng) -> dict:
+    """``{input: column}`` of n plausible raw records drawn from a spec's input ranges."""
+    out = {}
+    for name, meta in spec.inputs.items():
+        kind = meta.get("kind", "number")
+        if kind == "choice":
+            out[name] = rng.choice(np.asarray(meta["options"], dtype=object), size=n)
+        elif kind == "binary":
+            out[name] = rng.integers(0, 2, size=n)
+        else:
+            lo, hi = float(meta.get("min", 0.0)), float(meta.get("max", 100.0))
+            col = rng.uniform(lo, hi, size=n)
+            out[name] = np.round(col) if kind == "integer" else col
+    return out
+
+
+def bench_rerun(repeat: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    from omm.profile import pages
+
+    out = {}
+    for page in pages():
+        at = AppTest.from_file(str(ROOT / page), default_timeout=120)
+        at.run()
+        out[f"rerun_ms/{page}"] = _median_time(at.run, repeat) * 1e3
+    return out
+
+
+def bench_load(repeat: int) -> dict:
+    import joblib
+    import sklearn.ensemble  # noqa: F401  (import cost is not the artifact's)
+
+    out = {f"load_ms/{path}": _median_time(lambda: joblib.load(ROOT / path), repeat) * 1e3
+           for path in ARTIFACTS}
+    out.update({f"load_ms/{path}": _median_time(lambda: store.open_forest(ROOT / path), repeat) * 1e3
+                for path in store.FORESTS})
+    return out
+
+
+def _predict_metrics(name, single, batch, repeat) -> dict:
+    out = {f"single_us/{name}": _median_time(single, repeat * 10) * 1e6,
+           f"batch_ms/{name}": _median_time(batch, repeat) * 1e3}
+    tracemalloc.start()
+    batch()
+    out[f"batch_peak_mb/{name}"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return out
+
+
+def bench_predict(repeat: int) -> dict:
+    rng = np.random.default_rng(0)
+    out = {}
+    for name, spec in engine.CALCULATORS.items():
+        records = random_records(spec, BATCH_ROWS, rng)
+        one = {k: v[0].item() if hasattr(v[0], "item") else v[0] for k, v in records.items()}
+        out.update(_predict_metrics(name, lambda: spec.evaluate(one),
+                                    lambda: engine.score_records(spec, records), repeat))
+    for name in models.NAMES:
+        forest = models.flat(name)
+        X = rng.integers(0, 3, size=(BATCH_ROWS, len(models.get(name).features))).astype(np.float64)
+        out.update(_predict_metrics(name, lambda: forest.predict_proba(X[:1]),
+                                    lambda: forest.predict_proba(X), repeat))
+    return out
+
+
+def run(sections=SECTIONS, repeat: int = 5) -> dict:
+    import sklearn
+
+    os.chdir(ROOT)  # pages open artifacts by relative path
+    benches = {"rerun": bench_rerun, "load": bench_load, "predict": bench_predict}
+    metrics = {}
+    for s in sections:
+        metrics.update(benches[s](repeat))
+    metrics["rss_peak_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "numpy": np.__version__, "sklearn": sklearn.__version__, "machine": platform.machine(),
+                 "sections": list(sections), "repeat": repeat},
+        "metrics": metrics,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """``(metric, baseline, current, ratio, regressed)`` for metrics present in both runs."""
+    rows = []
+    for name, value in current["metrics"].items():
+        old = baseline["metrics"].get(name)
+        if old is None or old <= 0:
+            continue
+        ratio = value / old
+        rows.append((name, old, value, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m omm.bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--only", default=",".join(SECTIONS), help=f"comma-separated subset of {SECTIONS}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    sections = [s for s in args.only.split(",") if s]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections {sorted(unknown)}")
+    output = args.output and os.path.abspath(args.output)
+    baseline_path = args.compare and os.path.abspath(args.compare)
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.CRITICAL)
+
+    result = run(sections, args.repeat)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+    if not baseline_path:
+        for name, value in result["metrics"].items():
+            print(f"{name:48s} {value:12.3f}")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(result, baseline, args.tolerance)
+    for name, old, new, ratio, bad in rows:
+        print(f"{name:48s} {old:12.3f} {new:12.3f} {ratio:6.2f}x{'  REGRESSION' if bad else ''}")
+    regressions = sum(r[4] for r in rows)
+    print(f"{regressions} regression(s) over {args.tolerance:.0%} in {len(rows)} metrics")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
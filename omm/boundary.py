@@ -0,0 +1,176 @@
+"""Decision boundaries of the closed-form calculators.
+
+With every other input fixed, the index of a spec calculator is linear in
+each continuous input — or piecewise linear when the input enters a ``min``
+feature, with a break where it equals its partner — so the value at which
+the verdict flips has a closed form.  For logistic models the probability
+thresholds are moved to the index scale first (``logit(t)``).
+
+    >>> from omm.boundary import solve
+    >>> solve(load("macrosomia"), "ast", {"hdl": 1.2, "pparg_p12a": 1, "luteal_support": 0})
+    [Boundary(value=70.6297..., threshold=0.0, below=0, above=1, in_range=True)]
+
+:func:`solve_records` answers the same question for every row of a batch in
+a few vectorized passes; :func:`panel` renders the answer under a page's result.
+
+Only the single-patient path is numpy-free (the pages import it).
+"""
+import math
+from typing import NamedTuple
+
+from omm.spec import Spec, source_inputs
+
+CONTINUOUS = ("number",)  # integer inputs are scores and codes (Apgar, genotype)
+TRANSFORM_KEYS = ("map", "eq", "in", "lt", "le", "gt", "ge")
+
+
+class Boundary(NamedTuple):
+    value: float      # input value at which the class changes
+    threshold: float  # the spec threshold crossed (probability scale for logistic models)
+    below: int        # class just below ``value``
+    above: int        # class just above ``value``
+    in_range: bool    # within the input's min/max
+
+
+def cut(spec: Spec, threshold: float) -> float:
+    """A threshold on the index scale."""
+    if spec.link != "logistic":
+        return threshold
+    if not 0.0 < threshold < 1.0:
+        return math.copysign(math.inf, threshold - 0.5)
+    return math.log(threshold / (1.0 - threshold))
+
+
+def solvable(spec: Spec, name: str) -> bool:
+    """Whether the index is (piecewise) linear in input ``name``."""
+    if spec.inputs.get(name, {}).get("kind", "number") not in CONTINUOUS:
+        return False
+    used = False
+    for f in spec.features:
+        if name not in source_inputs(f):
+            continue
+        if any(k in f for k in TRANSFORM_KEYS) or ("bmi" in f and f["bmi"][1] == name):
+            return False
+        used = True
+    return used
+
+
+def continuous_inputs(spec: Spec) -> list:
+    return [name for name in spec.inputs if solvable(spec, name)]
+
+
+def breakpoints(spec: Spec, name: str) -> list:
+    """Inputs whose value is a break of the index as a function of ``name`` (``min`` partners)."""
+    return [other for f in spec.features if "min" in f and name in f["min"]
+            for other in f["min"] if other != name]
+
+
+def _in_range(spec: Spec, name: str, value: float) -> bool:
+    meta = spec.inputs[name]
+    return meta.get("min", -math.inf) <= value <= meta.get("max", math.inf)
+
+
+def _pieces(points: list):
+    """``(lo, hi, xa, xb)`` per linear piece: its bounds and two points to fit it on."""
+    if not points:
+        return [(-math.inf, math.inf, 0.0, 1.0)]
+    bounds = [-math.inf] + sorted(points) + [math.inf]
+    out = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        xa = hi - 1.0 if lo == -math.inf else lo
+        xb = lo + 1.0 if hi == math.inf else hi
+        if xb > xa:
+            out.append((lo, hi, xa, xb))
+    return out
+
+
+def solve(spec: Spec, name: str, record: dict) -> list:
+    """Every value of input ``name`` at which the class changes, others as in ``record``."""
+    if not solvable(spec, name):
+        raise ValueError(f"{spec.name}: the index is not linear in {name!r}")
+    points = [float(record.get(other, math.nan)) for other in breakpoints(spec, name)]
+    if any(math.isnan(p) for p in points):
+        return []
+
+    def index(x):
+        return spec.index(spec.encode(dict(record, **{name: x})))
+
+    out = []
+    for lo, hi, xa, xb in _pieces(points):
+        za, zb = index(xa), index(xb)
+        slope = (zb - za) / (xb - xa)
+        if math.isnan(slope) or slope == 0.0:
+            continue
+        for k, t in enumerate(spec.thresholds):
+            x = xa + (cut(spec, t) - za) / slope
+            if lo <= x <= hi and not any(b.value == x and b.threshold == t for b in out):
+                below, above = (k, k + 1) if slope > 0 else (k + 1, k)
+                out.append(Boundary(x, t, below, above, _in_range(spec, name, x)))
+    return sorted(out)
+
+
+def solve_records(spec: Spec, name: str, data) -> dict:
+    """Boundary nearest to each row's current value, per threshold, for a whole batch.
+
+    Returns ``{threshold: (N,) array}`` (NaN where the verdict never flips).
+    """
+    import numpy as np
+
+    from omm import engine
+
+    if not solvable(spec, name):
+        raise ValueError(f"{spec.name}: the index is not linear in {name!r}")
+    columns = {k: np.asarray(data[k]) for k in spec.inputs if k in data}
+    n = len(next(iter(columns.values()))) if columns else 0
+
+    def numeric(k):
+        return np.asarray(columns[k], dtype=np.float64) if k in columns else np.full(n, np.nan)
+
+    current = numeric(name)
+    partners = [numeric(o) for o in breakpoints(spec, name)]
+    bounds = np.column_stack([np.full(n, -np.inf)] + partners + [np.full(n, np.inf)])
+    bounds[:, 1:-1].sort(axis=1)
+
+    def index(x):
+        return engine.score_records(spec, dict(columns, **{name: x})).index
+
+    out = {t: np.full(n, np.nan) for t in spec.thresholds}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for j in range(bounds.shape[1] - 1):
+            lo, hi = bounds[:, j], bounds[:, j + 1]
+            xa = np.where(np.isinf(lo), hi - 1.0, lo)
+            xb = np.where(np.isinf(hi), lo + 1.0, hi)
+            xa = np.where(np.isinf(xa), 0.0, xa)  # no breakpoints: one piece, fit on 0 and 1
+            xb = np.where(np.isinf(xb), 1.0, xb)
+            za, zb = index(xa), index(xb)
+            slope = (zb - za) / (xb - xa)
+            for t in spec.thresholds:
+                x = xa + (cut(spec, t) - za) / slope
+                ok = (lo <= x) & (x <= hi) & (slope != 0)
+                best = out[t]
+                closer = ok & ~(np.abs(best - current) <= np.abs(x - current))
+                best[closer] = x[closer]
+    return out
+
+
+# ── Page panel ───────────────────────────────────────────────────────────────
+
+def describe(spec: Spec, name: str, boundaries: list) -> str:
+    label = spec.inputs[name].get("label", name)
+    if not boundaries:
+        return f"**{label}**: вердикт не меняется ни при каком значении."
+    parts = []
+    for b in boundaries:
+        note = "" if b.in_range else " (вне допустимого диапазона)"
+        parts.append(f"при **{b.value:.4g}**{note}: ниже — «{spec.labels[b.below]}», "
+                     f"выше — «{spec.labels[b.above]}»")
+    return f"**{label}**: вердикт меняется " + "; ".join(parts) + "."
+
+
+def panel(st, spec: Spec, record: dict, names=None):
+    """Expander with the flip value of each continuous input, the other inputs as entered."""
+    with st.expander("🎯 Пороговые значения", expanded=False):
+        st.caption("Значение показателя, при котором меняется заключение, если остальные "
+                   "показатели остаются такими, как введено.")
+        for name in names or continuous_inputs(spec):
+            st.markdown(describe(spec, name, solve(spec, name, record)))
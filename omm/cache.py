@@ -0,0 +1,108 @@
+"""Process-wide memo of model predictions for the Streamlit pages.
+
+Streamlit reruns a page on every widget change, so the same patient is often
+scored again (a checkbox toggled back, a form re-submitted).  :data:`PREDICTIONS`
+remembers recent results, keyed by the model version and the exact input
+vector, and is shared by every session of the server process:
+
+    >>> p = PREDICTIONS.get_or_compute(model_version("vpch/forest_surg"), x,
+    ...                                lambda: forest.predict_proba(x)[0, 1])
+
+The vector is canonicalized first (float64, ``-0.0`` as ``0.0``, one NaN), so
+``1`` and ``1.0`` share an entry.  The cache is bounded (least recently used
+entries are evicted) and entries expire after a time-to-live; both are set by
+``OMM_PREDICTION_CACHE_SIZE`` (default 4096) and ``OMM_PREDICTION_CACHE_TTL``
+(seconds, default 3600; 0 keeps entries until evicted).  The hit rate is
+logged (``omm.cache``, INFO) every :data:`LOG_EVERY` lookups.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from omm.store import MANIFEST
+
+CACHE_SIZE = int(os.environ.get("OMM_PREDICTION_CACHE_SIZE", "4096"))
+CACHE_TTL = float(os.environ.get("OMM_PREDICTION_CACHE_TTL", "3600"))
+LOG_EVERY = 1000
+
+log = logging.getLogger(__name__)
+
+
+def model_version(*paths) -> str:
+    """Identifies the current files of a model: path, mtime and size of each.
+
+    A forest store directory stands for its manifest, which every export rewrites.
+    """
+    parts = []
+    for path in paths:
+        path = os.fspath(path)
+        target = os.path.join(path, MANIFEST) if os.path.isdir(path) else path
+        st = os.stat(target)
+        parts.append(f"{path}@{st.st_mtime_ns:x}:{st.st_size:x}")
+    return "|".join(parts)
+
+
+def canonical(x) -> bytes:
+    x = np.asarray(x, dtype=np.float64).ravel() + 0.0  # + 0.0 turns -0.0 into 0.0
+    return np.where(np.isnan(x), np.nan, x).tobytes()
+
+
+class PredictionCache:
+    """Bounded LRU map ``(model version, input vector) -> prediction`` with a TTL."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, version: str, x, compute):
+        """Cached result for ``x`` under ``version``, else ``compute()`` (stored)."""
+        key = (version, canonical(x))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (not self.ttl or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if (self.hits + self.misses) % LOG_EVERY == 0:
+                    log.info("%s", self.summary())
+                return entry[1]
+            self.misses += 1
+            if (self.hits + self.misses) % LOG_EVERY == 0:
+                log.info("%s", self.summary())
+        value = compute()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def summary(self) -> str:
+        """One-line summary for the log."""
+        return (f"prediction cache: {self.hits} hits of {self.hits + self.misses} lookups "
+                f"({self.hit_rate:.0%}), {len(self._entries)} entries")
+
+
+PREDICTIONS = PredictionCache()
@@ -0,0 +1,107 @@
+"""Partial-dependence and ICE curves of the forest calculators.
+
+An ICE curve is the prediction for one patient as a single feature sweeps
+a grid, the other features as entered; a partial-dependence (PD) curve is
+the same averaged over a population.  Every grid point of every requested
+feature is stacked into one matrix and scored by one ``predict_proba``
+call (a :class:`~omm.forest.ForestGroup` scores all its members in that
+pass), so the ICE curves of the 20 top features of a patient cost one
+batch of a few hundred rows:
+
+    >>> grids = [Grid(column, grid("continuous", 0, 100)) for column in top]
+    >>> curves = ice(forest, x, grids)                  # [(G,) per grid]
+    >>> population = partial_dependence(forest, X, grids)
+
+When no training rows ship with a model (vpch), :func:`cover_dependence`
+gives the PD with respect to the training distribution recorded in the
+trees themselves: splits on the swept feature follow the grid value, every
+other split is averaged by its training covers (sklearn's ``recursion``
+method).  Pages compute the population curves once per model and cache them.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from omm.explain import paths
+from omm.forest import FlatForest, ForestGroup
+
+GRID_POINTS = 25
+
+
+class Grid(NamedTuple):
+    column: int         # position of the feature in the input vector
+    values: np.ndarray  # (G,) grid
+
+
+def grid(kind: str, low=0.0, high=1.0, values=None, points: int = GRID_POINTS) -> np.ndarray:
+    """Grid of a binary, discrete (``values``) or continuous (``low``..``high``) feature."""
+    if kind == "binary":
+        return np.array([0.0, 1.0])
+    if kind == "discrete":
+        return np.asarray(sorted(values), dtype=np.float64)
+    return np.linspace(float(low), float(high), points)
+
+
+def _predict(model, X: np.ndarray, column: int) -> np.ndarray:
+    if isinstance(model, ForestGroup):
+        return model.predict_proba(X, column)  # (N, members)
+    return model.predict_proba(X)[:, column]
+
+
+def _split(values: np.ndarray, grids: list) -> list:
+    return np.split(values, np.cumsum([len(g.values) for g in grids])[:-1])
+
+
+def stack(X, grids: list) -> np.ndarray:
+    """Rows of ``X`` repeated per grid point, the swept column set: (sum G × N, n), grid-point major."""
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    n = len(X)
+    out = np.tile(X, (sum(len(g.values) for g in grids), 1))
+    start = 0
+    for g in grids:
+        stop = start + len(g.values) * n
+        out[start:stop, g.column] = np.repeat(g.values, n)
+        start = stop
+    return out
+
+
+def ice(model, x, grids: list, column: int = 1) -> list:
+    """ICE curve of row ``x`` for every grid, from one batch: [(G,) or (G, members)]."""
+    return _split(_predict(model, stack(x, grids), column), grids)
+
+
+def partial_dependence(model, X, grids: list, column: int = 1) -> list:
+    """Mean ICE curve over the rows of ``X`` for every grid, from one batch."""
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    p = _predict(model, stack(X, grids), column)
+    p = p.reshape((-1, len(X)) + p.shape[1:]).mean(axis=1)
+    return _split(p, grids)
+
+
+def cover_dependence(forest: FlatForest, grids: list, column: int = 1) -> list:
+    """PD of every grid with respect to the trees' training covers; no data needed."""
+    p = paths(forest)
+    leaf_value = forest.value_by_class[column][p.leaf] / forest.n_trees
+    out = []
+    for g in grids:
+        others = np.where(p.feature == g.column, 1.0, p.zero).prod(axis=1)  # padding slots have z = 1
+        on_path = p.valid & (forest.feature[p.node] == g.column)
+        v = np.asarray(g.values, dtype=np.float32)[:, None, None]
+        follows = ((v <= forest.threshold32[p.node]) == p.left) | ~on_path   # (G, L, D)
+        out.append(follows.all(axis=2) @ (leaf_value * others))
+    return out
+
+
+def figure(x, curves: dict, label: str = "", discrete: bool = False):
+    """Lines of several curves over grid ``x``: ``{name: (values, dash, color)}``, probabilities in %."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    mode = "lines+markers" if discrete else "lines"
+    for name, (values, dash, color) in curves.items():
+        fig.add_trace(go.Scatter(x=x, y=np.asarray(values) * 100, mode=mode, name=name,
+                                 line=dict(dash=dash, color=color)))
+    fig.update_layout(xaxis_title=label, yaxis=dict(title="Вероятность, %", range=[0, 100]),
+                      height=380, margin=dict(l=10, r=10, t=10, b=10),
+                      legend=dict(orientation="h", y=-0.25))
+    return fig
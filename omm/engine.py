@@ -0,0 +1,259 @@
+"""Vectorized batch scoring for the closed-form (linear / logistic) calculators.
+
+Coefficients, encodings and thresholds come from the declarative specs in
+``omm/specs`` (see :mod:`omm.spec`), the same ones the Streamlit pages use.
+
+Score an already-encoded feature matrix with one calculator:
+
+    >>> from omm.engine import score
+    >>> res = score("macrosomia", X)        # X: N×k array or DataFrame
+    >>> res.index, res.probability, res.label
+
+or score raw patient records against every calculator at once:
+
+    >>> compiled = compile_specs()
+    >>> res = compiled.score(records)       # DataFrame / {input: column}
+    >>> res.index[:, compiled.position("placenta")]
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from omm import spec as specs
+from omm.spec import COMPARISONS, Spec
+
+CALCULATORS = specs.load_all()
+
+
+class Scores(NamedTuple):
+    index: np.ndarray        # linear predictor, shape (N,) or (N, C)
+    probability: np.ndarray  # logistic(index); NaN for identity-link models
+    label: np.ndarray        # class number, -1 where the index is NaN
+
+
+def logistic(z):
+    """Numerically stable 1 / (1 + exp(-z))."""
+    with np.errstate(invalid="ignore"):
+        return np.exp(-np.logaddexp(0.0, -np.asarray(z, dtype=np.float64)))
+
+
+def classify(value, thresholds, inclusive=False) -> np.ndarray:
+    """Count thresholds passed by each value; NaN rows get -1."""
+    value = np.asarray(value, dtype=np.float64)
+    side = "right" if inclusive else "left"
+    label = np.searchsorted(np.asarray(thresholds, dtype=np.float64), value, side=side).astype(np.int8)
+    label[np.isnan(value)] = -1
+    return label
+
+
+def get(name) -> Spec:
+    if isinstance(name, Spec):
+        return name
+    try:
+        return CALCULATORS[name]
+    except KeyError:
+        raise KeyError(f"unknown calculator {name!r}; known: {', '.join(sorted(CALCULATORS))}") from None
+
+
+# ── Encoding raw inputs ───────────────────────────────────────────────────────
+
+def _column(data, name: str, n: int) -> np.ndarray:
+    if name not in data:
+        return np.full(n, np.nan)
+    return np.asarray(data[name])
+
+
+def _numeric(col) -> np.ndarray:
+    col = np.asarray(col)
+    if col.dtype.kind == "O":
+        col = np.where(col == "", None, col)
+    return col.astype(np.float64)
+
+
+def _categories(col) -> np.ndarray:
+    """:func:`omm.spec.category` of every value of ``col``, as an object array (NaN → None)."""
+    col = np.asarray(col)
+    if col.dtype.kind == "b":
+        col = col.astype(np.int8)
+    if col.dtype.kind in "iu":
+        return col.astype(str).astype(object)
+    if col.dtype.kind == "f":
+        out = np.full(col.shape, None, dtype=object)
+        ok = ~np.isnan(col)
+        ints = ok & (col == np.round(np.where(ok, col, 0)))
+        out[ints] = col[ints].astype(np.int64).astype(str)
+        out[ok & ~ints] = col[ok & ~ints].astype(str)
+        return out
+    return np.array([specs.category(v) for v in col.ravel()], dtype=object).reshape(col.shape)
+
+
+def _is_missing(col) -> np.ndarray:
+    if col.dtype.kind == "f":
+        return np.isnan(col)
+    if col.dtype.kind == "O":
+        return np.array([v is None or v == "" or (isinstance(v, float) and v != v) for v in col], dtype=bool)
+    return np.zeros(col.shape, dtype=bool)
+
+
+def encode_feature(feature: dict, data, n: int) -> np.ndarray:
+    """Vectorized counterpart of :func:`omm.spec.encode_feature`."""
+    if "diff" in feature:
+        a, b = (_numeric(_column(data, c, n)) for c in feature["diff"])
+        value = a - b
+    elif "min" in feature:
+        a, b = (_numeric(_column(data, c, n)) for c in feature["min"])
+        value = np.minimum(a, b)
+    elif "bmi" in feature:
+        w, h = (_numeric(_column(data, c, n)) for c in feature["bmi"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.where(h > 0, w / (h / 100.0) ** 2, np.nan)
+    else:
+        value = _column(data, feature.get("input", feature["name"]), n)
+
+    if "map" in feature:
+        cats = _categories(value)
+        out = np.full(n, float(feature.get("default", np.nan)))
+        for key, code in feature["map"].items():
+            out[cats == key] = code
+        return out
+    if "eq" in feature or "in" in feature:
+        members = [feature["eq"]] if "eq" in feature else feature["in"]
+        cats = _categories(value)
+        out = np.zeros(n)
+        for m in members:
+            out[cats == m] = 1.0
+        out[_is_missing(np.asarray(value))] = np.nan
+        return out
+    value = _numeric(value)
+    for key, op in COMPARISONS.items():
+        if key in feature:
+            out = op(value, feature[key]).astype(np.float64)
+            out[np.isnan(value)] = np.nan
+            return out
+    return value
+
+
+def _length(data) -> int:
+    if hasattr(data, "shape"):
+        return len(data)
+    lengths = {np.size(v) for v in data.values()}
+    if len(lengths) > 1:
+        raise ValueError("input columns have different lengths")
+    return lengths.pop() if lengths else 0
+
+
+def _as_columns(data):
+    """Accept a DataFrame, ``{input: column}`` or one record ``{input: scalar}``."""
+    if hasattr(data, "columns"):
+        return data
+    return {k: np.atleast_1d(np.asarray(v, dtype=object if isinstance(v, str) else None))
+            for k, v in data.items()}
+
+
+def encode(name, data) -> np.ndarray:
+    """Encode raw inputs into the (N, k) feature matrix of one calculator."""
+    s = get(name)
+    data = _as_columns(data)
+    n = _length(data)
+    return np.column_stack([encode_feature(f, data, n) for f in s.features]) if s.features else np.empty((n, 0))
+
+
+# ── Scoring ───────────────────────────────────────────────────────────────────
+
+def matrix(name, X) -> np.ndarray:
+    """Return X as a float64 (N, k) array in the calculator's feature order."""
+    s = get(name)
+    if hasattr(X, "columns"):
+        return X[list(s.feature_names)].to_numpy(dtype=np.float64)
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.shape[1] != len(s.features):
+        raise ValueError(f"{s.name}: expected {len(s.features)} columns, got {X.shape[1]}")
+    return X
+
+
+def _finish(s: Spec, z: np.ndarray) -> Scores:
+    if s.link == "logistic":
+        p = logistic(z)
+        return Scores(z, p, classify(p, s.thresholds, s.inclusive))
+    return Scores(z, np.full_like(z, np.nan), classify(z, s.thresholds, s.inclusive))
+
+
+def score(name, X) -> Scores:
+    """Score every row of an encoded feature matrix X (N×k array or DataFrame)."""
+    s = get(name)
+    return _finish(s, matrix(s, X) @ np.asarray(s.coefs, dtype=np.float64) + s.intercept)
+
+
+def score_records(name, data) -> Scores:
+    """Score raw patient inputs (DataFrame or ``{input: column}``) with one calculator."""
+    s = get(name)
+    return _finish(s, encode(s, data) @ np.asarray(s.coefs, dtype=np.float64) + s.intercept)
+
+
+# ── Compiled set ──────────────────────────────────────────────────────────────
+
+class Compiled:
+    """All calculators stacked into one (features × calculators) coefficient matrix."""
+
+    def __init__(self, spec_list):
+        self.specs = list(spec_list)
+        self.names = [s.name for s in self.specs]
+        encodings = {}
+        for s in self.specs:
+            for f in s.features:
+                enc = {k: v for k, v in f.items() if k != "coef"}
+                if encodings.setdefault(f["name"], enc) != enc:
+                    raise ValueError(f"feature {f['name']!r} is encoded differently in {s.name}")
+        self.feature_names = list(encodings)
+        self.encodings = [encodings[n] for n in self.feature_names]
+        col = {n: i for i, n in enumerate(self.feature_names)}
+
+        self.W = np.zeros((len(self.feature_names), len(self.specs)))
+        for j, s in enumerate(self.specs):
+            for f in s.features:
+                self.W[col[f["name"]], j] = f["coef"]
+        self.used = (self.W != 0).astype(np.float64)
+        self.intercept = np.array([s.intercept for s in self.specs])
+        self.logistic = np.array([s.link == "logistic" for s in self.specs])
+        # ``v >= t`` is evaluated as ``v > nextafter(t, -inf)`` so every column uses one comparison
+        width = max(len(s.thresholds) for s in self.specs)
+        self.thresholds = np.full((width, len(self.specs)), np.inf)
+        for j, s in enumerate(self.specs):
+            t = np.asarray(s.thresholds, dtype=np.float64)
+            self.thresholds[:len(t), j] = np.nextafter(t, -np.inf) if s.inclusive else t
+
+    def position(self, name: str) -> int:
+        return self.names.index(name)
+
+    def features(self, data) -> np.ndarray:
+        """Encode raw records into the shared (N, F) feature matrix."""
+        data = _as_columns(data)
+        n = _length(data)
+        return np.column_stack([encode_feature(e, data, n) for e in self.encodings])
+
+    def score_features(self, F: np.ndarray) -> Scores:
+        missing = np.isnan(F)
+        if missing.any():
+            z = np.where(missing, 0.0, F) @ self.W + self.intercept
+            z[(missing.astype(np.float64) @ self.used) > 0] = np.nan
+        else:
+            z = F @ self.W + self.intercept
+        p = np.full_like(z, np.nan)
+        p[:, self.logistic] = logistic(z[:, self.logistic])
+        value = np.where(self.logistic, p, z)
+        label = np.zeros(z.shape, dtype=np.int8)
+        for row in self.thresholds:
+            label += value > row
+        label[np.isnan(z)] = -1
+        return Scores(z, p, label)
+
+    def score(self, data) -> Scores:
+        """Score raw records against every calculator; columns follow ``self.names``."""
+        return self.score_features(self.features(data))
+
+
+def compile_specs(names=None) -> Compiled:
+    names = sorted(CALCULATORS) if names is None else names
+    return Compiled(get(n) for n in names)
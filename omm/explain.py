@@ -0,0 +1,178 @@
+"""Exact per-patient SHAP attributions for the flattened forests.
+
+Path-dependent TreeSHAP (Lundberg et al., 2018): the prediction of a forest
+is split into a base value (the training-weighted mean prediction) plus one
+attribution per feature, exactly, with the missing features of a coalition
+integrated out along the training covers of the tree — the same quantity
+``shap.TreeExplainer(model).shap_values`` computes, without its dependency.
+
+Each leaf contributes a product game over the distinct features on its
+path: feature ``j`` either matches the row's branch (``o_j`` = 1 or 0) or is
+averaged over both (``z_j``, the product of cover ratios).  The Shapley
+value of such a game is a polynomial in those factors (O(depth²) vectorized
+passes over all leaves at once), and since ``o`` is binary a leaf has only
+2^depth distinct games: they are solved once per forest, and explaining a
+row is a lookup of its pattern at every leaf plus one sum per feature:
+
+    >>> e = explain(models.load_vpch("surg"), X)
+    >>> e.base + e.values.sum(axis=1)   # == forest.predict_proba(X)[:, 1]
+
+Paths shorter than the forest depth are padded with null players, which do
+not change the Shapley values of the others.  The first explanation of a
+forest builds its table (tens of milliseconds, a few MB); after that one
+patient takes well under a millisecond and a cohort is explained chunk by
+chunk in the same call.  The table grows as 2^depth; forests deeper than
+:data:`MAX_TABLE_DEPTH` are not tabulated and each row's games are solved
+directly, one row at a time.
+"""
+from functools import lru_cache
+from math import factorial
+from typing import NamedTuple
+
+import numpy as np
+
+from omm.forest import CHUNK_ROWS, FlatForest
+
+TOP_N = 10
+MAX_TABLE_DEPTH = 8  # (L, 2^D, D) float64: ~26 MB for the 1 600 leaves of a depth-8 vpch forest
+
+
+class Paths(NamedTuple):
+    leaf: np.ndarray     # (L,) node id of every leaf of every tree
+    node: np.ndarray     # (L, D) split nodes on the path root → leaf (0 past the end)
+    left: np.ndarray     # (L, D) the path goes left at that node
+    valid: np.ndarray    # (L, D) position is on the path
+    slot: np.ndarray     # (L, D) distinct-feature slot of each path node
+    feature: np.ndarray  # (L, D) feature of each slot (0 for padding)
+    zero: np.ndarray     # (L, D) cover fraction of each slot: share of training rows that reach the leaf's side
+
+
+class Explanation(NamedTuple):
+    base: float          # expected forest probability over the training covers
+    values: np.ndarray   # (N, columns of X) attributions; base + row sum = predict_proba[:, column]
+
+
+@lru_cache(maxsize=8)
+def paths(forest: FlatForest) -> Paths:
+    """Root-to-leaf paths of every tree, distinct features merged (built once per forest)."""
+    left, right, feature, cover = forest.left, forest.right, forest.feature, forest.cover
+    depth = max(forest.max_depth, 1)
+    leaves, nodes, dirs = [], [], []
+    for root in forest.roots:
+        stack = [(int(root), ())]
+        while stack:
+            n, path = stack.pop()
+            if left[n] == n:
+                leaves.append(n)
+                nodes.append([p for p, _ in path])
+                dirs.append([d for _, d in path])
+                continue
+            stack.append((int(right[n]), path + ((n, False),)))
+            stack.append((int(left[n]), path + ((n, True),)))
+
+    count = len(leaves)
+    out = {k: np.zeros((count, depth), dtype=t) for k, t in
+           (("node", np.intp), ("left", bool), ("valid", bool), ("slot", np.intp), ("feature", np.intp))}
+    zero = np.ones((count, depth))
+    for i, (path, went_left) in enumerate(zip(nodes, dirs)):
+        slots = {}
+        for p, (n, d) in enumerate(zip(path, went_left)):
+            child = left[n] if d else right[n]
+            s = slots.setdefault(int(feature[n]), len(slots))
+            out["node"][i, p], out["left"][i, p], out["valid"][i, p], out["slot"][i, p] = n, d, True, s
+            out["feature"][i, s] = feature[n]
+            zero[i, s] *= cover[child] / cover[n] if cover[n] > 0 else 0.0
+    return Paths(np.array(leaves, dtype=np.intp), out["node"], out["left"], out["valid"], out["slot"],
+                 out["feature"], zero)
+
+
+@lru_cache(maxsize=8)
+def games(forest: FlatForest) -> np.ndarray:
+    """(L, 2^D, D) Shapley value of each slot of each leaf for every follow pattern (bit d = slot d)."""
+    p = paths(forest)
+    depth = p.node.shape[1]
+    if depth > MAX_TABLE_DEPTH:
+        raise ValueError(f"forest depth {depth} exceeds MAX_TABLE_DEPTH={MAX_TABLE_DEPTH}; "
+                         "explain() solves such forests row by row")
+    patterns = (np.arange(2 ** depth)[:, None] >> np.arange(depth)) & 1
+    return _shapley(patterns[None].astype(np.float64), p.zero[:, None, :])
+
+
+def _shapley(o: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Shapley values of the product games ``v(S) = prod_{i in S} o_i prod_{i not in S} z_i`` (last axis: players)."""
+    o, z = np.broadcast_arrays(o, z)
+    depth = o.shape[-1]
+    weight = np.array([factorial(s) * factorial(depth - s - 1) / factorial(depth) for s in range(depth)])
+    # coefficients in t of prod_i (z_i + o_i t): the games' coalition sizes
+    poly = np.zeros(o.shape[:-1] + (depth + 1,))
+    poly[..., 0] = 1.0
+    for i in range(depth):
+        poly[..., 1:] = poly[..., 1:] * z[..., i, None] + poly[..., :-1] * o[..., i, None]
+        poly[..., 0] *= z[..., i]
+    phi = np.empty(o.shape)
+    for j in range(depth):
+        zj, oj = z[..., j], o[..., j]
+        # divide player j back out: by z_j when o_j = 0, by (z_j + t) when o_j = 1
+        without = np.empty(o.shape[:-1] + (depth,))
+        without[..., depth - 1] = poly[..., depth]
+        for s in range(depth - 1, 0, -1):
+            without[..., s - 1] = poly[..., s] - zj * without[..., s]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            divided = np.where(oj[..., None] > 0, without, poly[..., :depth] / zj[..., None])
+        phi[..., j] = (oj - zj) * (divided @ weight)
+    return np.nan_to_num(phi)
+
+
+def _patterns(forest: FlatForest, p: Paths, X: np.ndarray) -> np.ndarray:
+    """(N, L) follow pattern: bit d set when the row takes the leaf's branch at every split of slot d's feature."""
+    x = X[:, forest.feature]
+    go_left = x <= forest.threshold32
+    if np.isnan(X).any():
+        go_left |= np.isnan(x) & forest.missing_left
+    follows = (go_left[:, p.node] == p.left) | ~p.valid
+    o = np.ones(follows.shape, dtype=bool)
+    rows = np.arange(len(p.leaf))
+    for d in range(p.node.shape[1]):
+        o[:, rows, p.slot[:, d]] &= follows[:, :, d]
+    return o.astype(np.intp) @ (1 << np.arange(o.shape[-1]))
+
+
+def _attributions(forest: FlatForest, p: Paths, X: np.ndarray, column: int) -> np.ndarray:
+    n, width = X.shape
+    pattern = _patterns(forest, p, X)
+    depth = p.node.shape[1]
+    if depth <= MAX_TABLE_DEPTH:
+        phi = games(forest)[np.arange(len(p.leaf)), pattern]  # (N, L, D)
+    else:
+        o = (pattern[..., None] >> np.arange(depth)) & 1
+        phi = _shapley(o.astype(np.float64), p.zero[None])
+    phi *= (forest.value_by_class[column][p.leaf] / forest.n_trees)[None, :, None]
+    index = np.arange(n)[:, None, None] * width + p.feature[None]
+    return np.bincount(index.ravel(), weights=phi.ravel(), minlength=n * width).reshape(n, width)
+
+
+def explain(forest: FlatForest, X, column: int = 1) -> Explanation:
+    """TreeSHAP attributions of class ``classes[column]`` for every row of ``X``."""
+    p = paths(forest)
+    X = forest._rows(X)
+    base = float(forest.value_by_class[column][forest.roots].mean())
+    if not len(X):
+        return Explanation(base, np.zeros(X.shape))
+    chunk = CHUNK_ROWS if p.node.shape[1] <= MAX_TABLE_DEPTH else 1
+    values = np.concatenate([_attributions(forest, p, X[i:i + chunk], column)
+                             for i in range(0, len(X), chunk)])
+    return Explanation(base, values)
+
+
+def figure(names, values, top: int = TOP_N, title: str = ""):
+    """Horizontal bars of the ``top`` largest attributions of one row, in percentage points."""
+    import plotly.graph_objects as go
+
+    order = np.argsort(-np.abs(values))[:top][::-1]
+    v = np.asarray(values)[order] * 100
+    fig = go.Figure(go.Bar(x=v, y=[str(names[i]).strip() for i in order], orientation="h",
+                           marker_color=np.where(v >= 0, "#C62828", "#1565C0"),
+                           text=[f"{x:+.1f}" for x in v], textposition="outside"))
+    fig.update_layout(title=title, height=60 + 32 * len(order), xaxis_title="Вклад в вероятность, п.п.",
+                      yaxis_title="", margin=dict(l=10, r=10, t=40 if title else 10, b=10))
+    return fig
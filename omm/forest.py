@@ -0,0 +1,280 @@
+"""Random forests flattened into contiguous NumPy arrays.
+
+:class:`FlatForest` holds every node of every tree of a fitted
+``RandomForestClassifier`` in one set of arrays (children are global node
+ids; leaves point to themselves), so a batch of rows is pushed through all
+trees at once: one dense comparison of every split, then ``max_depth``
+vectorized steps, instead of one Python-level ``predict_proba`` per
+estimator.  When numba is installed the descent runs as a compiled loop
+instead.  :class:`ForestGroup` fuses several forests over the same columns
+(treatment_choice's surgery and wait models) into one descent.
+
+Probabilities match ``estimator.predict_proba`` to float rounding: rows are
+cast to float32 as sklearn does, so a float64 threshold ``t`` can be replaced
+by the largest float32 not above it without changing any ``x <= t``, and NaN
+follows each node's ``missing_go_to_left``.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+CHUNK_ROWS = 128
+LEVEL = 0.95
+
+
+class TreeSummary(NamedTuple):
+    """Distribution of the per-tree probabilities of one class, per row."""
+
+    mean: np.ndarray   # forest probability, = predict_proba[:, column]
+    std: np.ndarray    # spread between trees
+    low: np.ndarray    # lower / upper quantile of the per-tree probabilities (central ``level``)
+    high: np.ndarray
+    votes: np.ndarray  # fraction of trees whose own prediction is the class (p > 0.5)
+
+
+def summarize(p: np.ndarray, level: float = LEVEL) -> TreeSummary:
+    """:class:`TreeSummary` of per-tree probabilities ``p``, shape (N, trees)."""
+    # np.quantile's linear interpolation, from one partial sort of the four order statistics it needs
+    tail = (1.0 - level) / 2.0
+    pos = np.array([tail, 1.0 - tail]) * (p.shape[1] - 1)
+    below = np.floor(pos).astype(np.intp)
+    above = np.minimum(below + 1, p.shape[1] - 1)
+    part = np.partition(p, np.unique(np.concatenate([below, above])), axis=1)
+    low, high = (part[:, below] + (part[:, above] - part[:, below]) * (pos - below)).T
+    return TreeSummary(p.mean(axis=1), p.std(axis=1), low, high, (p > 0.5).mean(axis=1))
+
+
+def _concat(parts: list) -> TreeSummary:
+    return parts[0] if len(parts) == 1 else TreeSummary(*(np.concatenate(f) for f in zip(*parts)))
+
+
+def _apply_loop(X, roots, feature, threshold, left, right, missing_left, out):
+    for i in range(X.shape[0]):
+        for t in range(roots.shape[0]):
+            node = roots[t]
+            while left[node] != node:
+                x = X[i, feature[node]]
+                if x != x:
+                    node = left[node] if missing_left[node] else right[node]
+                elif x <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            out[i, t] = node
+
+
+_apply_jit = numba.njit(cache=True, nogil=True)(_apply_loop) if numba is not None else None
+
+
+class FlatForest:
+    """All trees of one forest as flat node arrays.
+
+    ``feature``/``threshold``/``left``/``right``/``missing_left`` describe the
+    splits, ``value`` the per-node class distribution (rows sum to 1) and
+    ``cover`` the weighted training samples reaching each node.  ``roots[t]``
+    is the node id of tree ``t``'s root.  ``children``, ``threshold32`` and
+    ``value_by_class`` are derived evaluation layouts; they are recomputed
+    unless given (e.g. memory-mapped by :mod:`omm.store`).
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, cover, roots,
+                 max_depth, classes, feature_names=None, children=None, threshold32=None, value_by_class=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.cover = cover
+        self.roots = roots
+        if children is None:
+            children = np.stack([left, right], axis=1).ravel()  # children[2*node + go_right]
+        if threshold32 is None:
+            t32 = threshold.astype(np.float32)
+            threshold32 = np.where(t32 > threshold, np.nextafter(t32, np.float32(-np.inf)), t32)
+        if value_by_class is None:
+            value_by_class = np.ascontiguousarray(value.T)
+        self.children = children
+        self.threshold32 = threshold32
+        self.value_by_class = value_by_class
+        self.max_depth = int(max_depth)
+        self.classes = classes
+        self.feature_names = None if feature_names is None else list(feature_names)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "FlatForest":
+        trees = [e.tree_ for e in forest.estimators_]
+        sizes = np.array([t.node_count for t in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        feature, threshold, left, right, missing, value, cover = [], [], [], [], [], [], []
+        for t, off in zip(trees, offsets):
+            ids = np.arange(t.node_count)
+            leaf = t.children_left == -1
+            feature.append(np.where(leaf, 0, t.feature))
+            threshold.append(np.where(leaf, 0.0, t.threshold))
+            left.append(np.where(leaf, ids, t.children_left) + off)
+            right.append(np.where(leaf, ids, t.children_right) + off)
+            missing.append(t.missing_go_to_left.astype(bool) & ~leaf)
+            v = t.value[:, 0, :forest.n_classes_].astype(np.float64)
+            norm = v.sum(axis=1, keepdims=True)
+            norm[norm == 0.0] = 1.0
+            value.append(v / norm)
+            cover.append(t.weighted_n_node_samples)
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            value=np.concatenate(value),
+            cover=np.concatenate(cover).astype(np.float64),
+            roots=offsets.astype(np.intp),
+            max_depth=max(t.max_depth for t in trees),
+            classes=np.asarray(forest.classes_),
+            feature_names=getattr(forest, "feature_names_in_", None),
+        )
+
+    ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "cover", "roots", "classes")
+    DERIVED = ("children", "threshold32", "value_by_class")
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_features(self) -> int:
+        return int(self.feature.max()) + 1 if self.feature_names is None else len(self.feature_names)
+
+    def _rows(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            X = X[self.feature_names] if self.feature_names is not None else X
+            X = X.to_numpy()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def _apply_numpy(self, X: np.ndarray) -> np.ndarray:
+        # Evaluate every split of every tree at once (a dense, cache-friendly
+        # comparison), then follow the precomputed directions down all trees.
+        n = len(X)
+        x = X[:, self.feature]
+        go_left = x <= self.threshold32
+        if np.isnan(X).any():
+            go_left |= np.isnan(x) & self.missing_left
+        go_right = (~go_left).view(np.uint8).ravel()
+        base = (np.arange(n) * len(self.feature))[:, None]
+        node = np.broadcast_to(self.roots, (n, self.n_trees))
+        for _ in range(self.max_depth):
+            node = self.children[2 * node + go_right[base + node]]
+        return node
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf node id reached by every row in every tree, shape (N, trees)."""
+        X = np.ascontiguousarray(self._rows(X))
+        if _apply_jit is not None:
+            out = np.empty((len(X), self.n_trees), dtype=np.intp)
+            _apply_jit(X, self.roots, self.feature, self.threshold, self.left, self.right,
+                       self.missing_left, out)
+            return out
+        if len(X) <= CHUNK_ROWS:
+            return self._apply_numpy(X)
+        return np.concatenate([self._apply_numpy(X[i:i + CHUNK_ROWS])
+                               for i in range(0, len(X), CHUNK_ROWS)])
+
+    def _proba(self, leaves: np.ndarray) -> np.ndarray:
+        return np.stack([v[leaves].sum(axis=1) for v in self.value_by_class], axis=1) / self.n_trees
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Mean of the per-tree leaf distributions, as ``RandomForestClassifier.predict_proba``."""
+        X = self._rows(X)
+        if len(X) <= CHUNK_ROWS:
+            return self._proba(self.apply(X))
+        return np.concatenate([self._proba(self.apply(X[i:i + CHUNK_ROWS]))
+                               for i in range(0, len(X), CHUNK_ROWS)])
+
+    def tree_proba(self, X, column: int = 1) -> np.ndarray:
+        """Probability of class ``classes[column]`` under every tree, shape (N, trees)."""
+        return self.value_by_class[column][self.apply(X)]
+
+    def predict_summary(self, X, column: int = 1, level: float = LEVEL) -> TreeSummary:
+        """Forest probability of ``classes[column]`` with its between-tree spread, interval and vote share.
+
+        The per-tree probabilities are gathered from the same leaves as the
+        mean, so this is one descent, like ``predict_proba``.
+        """
+        X = self._rows(X)
+        return _concat([summarize(self.tree_proba(X[i:i + CHUNK_ROWS], column), level)
+                        for i in range(0, max(len(X), 1), CHUNK_ROWS)])
+
+
+class ForestGroup:
+    """Several forests over the same columns, evaluated in one descent.
+
+    The member forests are concatenated into one :class:`FlatForest` (node ids
+    and roots offset per member), so a row is cast and validated once and all
+    trees of all members are walked in the same pass; the leaf values are
+    then averaged per member.  The concatenation is an in-memory copy of the
+    members' arrays.
+    """
+
+    def __init__(self, forests: dict):
+        members = list(forests.values())
+        if not members:
+            raise ValueError("no forests to group")
+        first = members[0]
+        for f in members[1:]:
+            if not np.array_equal(f.classes, first.classes) or f.feature_names != first.feature_names:
+                raise ValueError("grouped forests must share their classes and feature columns")
+        offsets = np.cumsum([0] + [len(f.feature) for f in members[:-1]])
+        self.names = tuple(forests)
+        self.forest = FlatForest(
+            feature=np.concatenate([f.feature for f in members]),
+            threshold=np.concatenate([f.threshold for f in members]),
+            left=np.concatenate([f.left + off for f, off in zip(members, offsets)]),
+            right=np.concatenate([f.right + off for f, off in zip(members, offsets)]),
+            missing_left=np.concatenate([f.missing_left for f in members]),
+            value=np.concatenate([f.value for f in members]),
+            cover=np.concatenate([f.cover for f in members]),
+            roots=np.concatenate([f.roots + off for f, off in zip(members, offsets)]),
+            max_depth=max(f.max_depth for f in members),
+            classes=np.asarray(first.classes),
+            feature_names=first.feature_names,
+            children=np.concatenate([f.children + off for f, off in zip(members, offsets)]),
+            threshold32=np.concatenate([f.threshold32 for f in members]),
+            value_by_class=np.concatenate([f.value_by_class for f in members], axis=1),
+        )
+        sizes = np.array([f.n_trees for f in members])
+        self.starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+        self.sizes = sizes
+
+    def _proba(self, leaves: np.ndarray, column: int) -> np.ndarray:
+        v = self.forest.value_by_class[column][leaves]
+        return np.add.reduceat(v, self.starts, axis=1) / self.sizes
+
+    def predict_proba(self, X, column: int = 1) -> np.ndarray:
+        """Probability of class ``classes[column]`` under each member, shape (N, members)."""
+        X = self.forest._rows(X)
+        if len(X) <= CHUNK_ROWS:
+            return self._proba(self.forest.apply(X), column)
+        return np.concatenate([self._proba(self.forest.apply(X[i:i + CHUNK_ROWS]), column)
+                               for i in range(0, len(X), CHUNK_ROWS)])
+
+    def predict_one(self, x, column: int = 1) -> tuple:
+        """``predict_proba`` of a single row, as a tuple in member order."""
+        return tuple(float(p) for p in self.predict_proba(x, column)[0])
+
+    def predict_summary(self, X, column: int = 1, level: float = LEVEL) -> TreeSummary:
+        """:meth:`FlatForest.predict_summary` per member; every field has shape (N, members)."""
+        X = self.forest._rows(X)
+        parts = []
+        for i in range(0, max(len(X), 1), CHUNK_ROWS):
+            p = self.forest.tree_proba(X[i:i + CHUNK_ROWS], column)
+            members = [summarize(p[:, s:s + n], level) for s, n in zip(self.starts, self.sizes)]
+            parts.append(TreeSummary(*(np.stack(f, axis=1) for f in zip(*members))))
+        return _concat(parts)
@@ -0,0 +1,63 @@
+"""Fixed input-vector layouts of the model calculators.
+
+A forest reads its features by position.  :class:`FeatureLayout` maps each
+feature name to its column once, so a page or a request writes values
+straight into a float64 array instead of building a dict, a one-row
+DataFrame and a reindexed copy per prediction:
+
+    >>> layout = FeatureLayout(feature_cols)
+    >>> x = layout.row()                 # this thread's reusable (1, n) buffer, zeroed
+    >>> x[0, layout.index["Возраст"]] = 30
+    >>> forest.predict_proba(x)
+
+:meth:`FeatureLayout.matrix` fills a fresh (N, n) array from records.  Absent
+features are 0, as on the pages.
+"""
+import threading
+
+import numpy as np
+
+
+class FeatureLayout:
+    """Column order of one model's input vector."""
+
+    def __init__(self, features):
+        self.features = tuple(features)
+        self.index = {f: j for j, f in enumerate(self.features)}
+        if len(self.index) != len(self.features):
+            raise ValueError("duplicate feature names")
+        self._local = threading.local()
+
+    def __len__(self):
+        return len(self.features)
+
+    def row(self) -> np.ndarray:
+        """Zeroed (1, n) buffer, reused by every call from the same thread.
+
+        Valid until this thread's next call; copy it if the vector must
+        outlive that (e.g. when handed to another thread).
+        """
+        buf = getattr(self._local, "row", None)
+        if buf is None:
+            buf = self._local.row = np.zeros((1, len(self.features)), dtype=np.float64)
+        else:
+            buf.fill(0.0)
+        return buf
+
+    def fill(self, out: np.ndarray, record: dict) -> np.ndarray:
+        """Write ``record`` into the row ``out`` in place (KeyError on unknown features)."""
+        index = self.index
+        for name, value in record.items():
+            out[index[name]] = float(value)
+        return out
+
+    def matrix(self, records, out=None) -> np.ndarray:
+        """(N, n) array of ``records`` (dicts), filled in place into ``out`` when given."""
+        if out is None:
+            out = np.zeros((len(records), len(self.features)), dtype=np.float64)
+        else:
+            out = out[:len(records)]
+            out.fill(0.0)
+        for i, record in enumerate(records):
+            self.fill(out[i], record)
+        return out
@@ -0,0 +1,54 @@
+"""Deferred imports of heavy libraries.
+
+    go = lazy_import("plotly.graph_objects")   # nothing imported yet
+    go.Figure()                                # imported here, on first use
+
+A page that needs pandas only behind a control the user has to act on (a
+file upload, a "show table" checkbox) does not pay for the import until
+then.  Every ``st.tabs`` body runs on each render, so a proxy touched there
+saves nothing.  Set ``OMM_LAZY_IMPORTS=0``
+to import eagerly instead (e.g. to compare start-up profiles with
+``python -m omm.profile``).
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+
+ENABLED = os.environ.get("OMM_LAZY_IMPORTS", "1") != "0"
+
+
+class _LazyModule:
+    """Stand-in for a module, imported under a lock on first attribute access.
+
+    ``importlib.util.LazyLoader`` is not safe when two threads (two sessions
+    of the server) touch the module first at the same time on Python < 3.12:
+    one of them can see it half-initialized.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name: str):
+    """Return module ``name``, executing it only when an attribute is first accessed."""
+    if name in sys.modules or not ENABLED:
+        return importlib.import_module(name)
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
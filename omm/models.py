@@ -0,0 +1,137 @@
+"""Model-backed (scikit-learn) calculators and their artifacts.
+
+Every artifact is read from disk at most once per process; callers share the
+returned objects and must treat them as read-only.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import joblib
+
+from omm import store
+from omm.forest import FlatForest, ForestGroup
+from omm.layout import FeatureLayout
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# treatment_choice artifacts, exported from data/models.pkl by ``python -m omm.treatment``
+SERVING = "data/models_serving.pkl"
+ANALYSIS = "data/models_analysis.pkl"
+TREATMENT_FORESTS = {"surg": "data/forest_surg", "wait": "data/forest_wait"}
+
+ENDOMETRIOSIS_GROUPS = ("Высокий риск рецидива эндометриоза", "Низкий риск рецидива эндометриоза")
+
+
+class ModelCalculator(NamedTuple):
+    name: str
+    title: str
+    estimator: object       # fitted classifier (or FlatForest) with predict_proba
+    features: tuple         # column order expected by the estimator
+    labels: tuple           # text for class 0 / class 1
+    inclusive: bool = False  # class 1 at p >= 0.5 (else p > 0.5, as predict() does)
+
+
+@lru_cache(maxsize=None)
+def load_joblib(relpath: str):
+    return joblib.load(ROOT / relpath)
+
+
+@lru_cache(maxsize=None)
+def load_json(relpath: str):
+    with open(ROOT / relpath, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def load_forest(relpath: str) -> FlatForest:
+    """Forest from a memory-mapped :mod:`omm.store` directory, shared read-only between processes."""
+    return store.open_forest(ROOT / relpath)
+
+
+@lru_cache(maxsize=None)
+def load_treatment() -> dict:
+    """Serving artifact of treatment_choice; ``forests`` are :class:`~omm.forest.FlatForest` objects,
+    ``pair`` both of them fused (:func:`load_treatment_pair`)."""
+    art = dict(load_joblib(SERVING))
+    art["forests"] = {k: load_forest(d) for k, d in TREATMENT_FORESTS.items()}
+    art["pair"] = load_treatment_pair()
+    return art
+
+
+@lru_cache(maxsize=None)
+def load_treatment_pair() -> ForestGroup:
+    """Surgery and wait forests in one descent: ``predict_proba(X)`` is (N, 2) ``[p_surg, p_wait]``."""
+    return ForestGroup({k: load_forest(d) for k, d in TREATMENT_FORESTS.items()})
+
+
+def load_treatment_analysis() -> dict:
+    """Training matrices, labels, AUCs and importance Series of treatment_choice (needs pandas)."""
+    return load_joblib(ANALYSIS)
+
+
+def load_vpch(group: str) -> FlatForest:
+    """Forest of the vpch ``surg`` or ``obs`` group (exported from ``vpch/model_<group>.pkl``)."""
+    return load_forest(f"vpch/forest_{group}")
+
+
+def vpch_feature_cols() -> list:
+    return load_json("vpch/feature_cols.json")
+
+
+def _endometriosis(name, title, path):
+    est = load_joblib(path)
+    return ModelCalculator(name, title, est, tuple(est.feature_names_in_), ENDOMETRIOSIS_GROUPS)
+
+
+def _treatment(name, title, key):
+    models = load_treatment()
+    return ModelCalculator(name, title, models["forests"][key], tuple(models["feature_names"]), ("Неуспех", "Успех"))
+
+
+def _vpch(name, title, group):
+    return ModelCalculator(name, title, load_vpch(group), tuple(vpch_feature_cols()),
+                           ("Отрицательный исход", "Положительный исход"), inclusive=True)
+
+
+_FACTORIES = {
+    "endometriosis": lambda: _endometriosis(
+        "endometriosis", "Рецидив эндометриоза (клиника и микробиота)", "model.joblib"),
+    "endometriosis_ihc": lambda: _endometriosis(
+        "endometriosis_ihc", "Рецидив эндометриоза (иммуногистохимия)", "model_1.joblib"),
+    "treatment_surg": lambda: _treatment(
+        "treatment_surg", "Успех хирургического лечения", "surg"),
+    "treatment_wait": lambda: _treatment(
+        "treatment_wait", "Успех выжидательной тактики", "wait"),
+    "vpch_surg": lambda: _vpch("vpch_surg", "ВПЧ: исход, хирургическая тактика", "surg"),
+    "vpch_obs": lambda: _vpch("vpch_obs", "ВПЧ: исход, наблюдательная тактика", "obs"),
+}
+
+NAMES = tuple(_FACTORIES)
+
+
+@lru_cache(maxsize=None)
+def get(name: str) -> ModelCalculator:
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        raise KeyError(f"unknown model {name!r}; known: {', '.join(NAMES)}") from None
+    return factory()
+
+
+@lru_cache(maxsize=None)
+def layout(name: str) -> FeatureLayout:
+    """Name → column map of the calculator's input vector, built once."""
+    return FeatureLayout(get(name).features)
+
+
+def load_all() -> dict:
+    return {name: get(name) for name in NAMES}
+
+
+@lru_cache(maxsize=None)
+def flat(name: str) -> FlatForest:
+    """The calculator's forest as a :class:`~omm.forest.FlatForest` (same probabilities, far less per-call overhead)."""
+    est = get(name).estimator
+    return est if isinstance(est, FlatForest) else FlatForest.from_sklearn(est)
@@ -0,0 +1,135 @@
+"""Start-up profile of the calculator pages.
+
+    python -m omm.profile                      # every page of streamlit_app.py
+    python -m omm.profile placenta.py vpch/app.py --top 5
+    python -m omm.profile --eager              # with OMM_LAZY_IMPORTS=0
+
+Each page runs once in a fresh interpreter (``python -X importtime``) under
+Streamlit's ``AppTest``, after Streamlit itself is imported.  Reported per page:
+
+* ``first_render_ms`` — one full script run, imports and model loading included;
+* ``import_ms``       — modules the page imported, summed by top-level package;
+* ``model_load_ms``   — time spent loading models: ``joblib.load``,
+  ``omm.store.open_forest`` and ``numpy.load`` (the memory-mapped forest
+  arrays, read on first use), nested calls counted once.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from omm.models import ROOT
+
+MARKER = "--- omm.profile: page start ---"
+
+_PROBE = """
+import logging, os, sys, time, warnings
+warnings.filterwarnings("ignore")
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, {root!r})
+import importlib.util
+from streamlit.testing.v1 import AppTest
+
+# Time the model loaders without importing their modules before the page does
+LOADERS = {{"joblib": "load", "omm.store": "open_forest", "numpy": "load"}}
+model_load = [0.0]
+depth = [0]
+def timed(load):
+    def timed_load(*args, **kwargs):
+        depth[0] += 1
+        t = time.perf_counter()
+        try:
+            return load(*args, **kwargs)
+        finally:
+            depth[0] -= 1
+            if not depth[0]:
+                model_load[0] += time.perf_counter() - t
+    return timed_load
+
+class PatchLoaders:
+    def find_spec(self, name, path=None, target=None):
+        if name not in LOADERS:
+            return None
+        sys.meta_path.remove(self)
+        try:
+            spec = importlib.util.find_spec(name)
+        finally:
+            sys.meta_path.insert(0, self)
+        exec_module = spec.loader.exec_module
+        def patched(module):
+            exec_module(module)
+            setattr(module, LOADERS[name], timed(getattr(module, LOADERS[name])))
+        spec.loader.exec_module = patched
+        return spec
+
+for name, attr in LOADERS.items():  # numpy comes in with streamlit
+    if name in sys.modules:
+        setattr(sys.modules[name], attr, timed(getattr(sys.modules[name], attr)))
+sys.meta_path.insert(0, PatchLoaders())
+
+at = AppTest.from_file({script!r}, default_timeout=120)
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+t = time.perf_counter()
+at.run()
+print(time.perf_counter() - t, model_load[0], len(at.exception))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def pages() -> list:
+    """Scripts registered in ``streamlit_app.py``, in menu order."""
+    return re.findall(r'\("([^"]+\.py)"', (ROOT / "streamlit_app.py").read_text(encoding="utf-8"))
+
+
+def import_times(stderr: str) -> dict:
+    """Self time (ms) of modules imported after the marker, grouped by top-level package."""
+    _, _, after = stderr.partition(MARKER)
+    out = defaultdict(float)
+    for m in _IMPORTTIME.finditer(after):
+        out[m.group(3).split(".")[0]] += int(m.group(1)) / 1000.0
+    return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+
+def profile_page(script: str, eager: bool = False) -> dict:
+    env = dict(os.environ, OMM_LAZY_IMPORTS="0" if eager else "1")
+    code = _PROBE.format(root=str(ROOT), script=str(ROOT / script), marker=MARKER)
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    render, model_load, errors = res.stdout.split()[-3:]
+    imports = import_times(res.stderr)
+    return {
+        "page": script,
+        "first_render_ms": float(render) * 1000.0,
+        "import_ms": sum(imports.values()),
+        "model_load_ms": float(model_load) * 1000.0,
+        "errors": int(errors),
+        "imports": imports,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m omm.profile", description=__doc__.split("\n")[0])
+    parser.add_argument("scripts", nargs="*", help="page scripts (default: all pages of streamlit_app.py)")
+    parser.add_argument("--top", type=int, default=3, help="packages to list per page")
+    parser.add_argument("--eager", action="store_true", help="disable lazy imports (OMM_LAZY_IMPORTS=0)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = [profile_page(s, args.eager) for s in args.scripts or pages()]
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=1))
+        return
+    print(f"{'page':32s} {'render':>8s} {'imports':>8s} {'models':>8s}  slowest imports (ms)")
+    for r in report:
+        top = ", ".join(f"{k} {v:.0f}" for k, v in list(r["imports"].items())[:args.top])
+        flag = "  [errors]" if r["errors"] else ""
+        print(f"{r['page']:32s} {r['first_render_ms']:8.0f} {r['import_ms']:8.0f} {r['model_load_ms']:8.0f}  {top}{flag}")
+
+
+if __name__ == "__main__":
+    main()
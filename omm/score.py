@@ -0,0 +1,200 @@
+"""Streaming command-line scorer for registry-scale files.
+
+    python -m omm.score --calculator placenta --input big.csv --output out.parquet
+    python -m omm.score --calculator vpch_surg --input cohort.parquet --output out.csv --keep id
+    python -m omm.score --calculator all --workers 32 --input cohort.parquet --output all.parquet
+
+The input is read in fixed-size chunks, each chunk is scored vectorized and
+appended to the output, so memory use does not grow with the file.
+
+* Formula calculators (``omm/specs``) read the raw inputs named in their spec
+  and apply its encodings (BMI from weight and height, age bands, scar
+  counts, ...); output columns are ``index``, ``probability`` (logistic
+  models only) and ``label``.
+* Model calculators (``omm.models``) read their feature columns (absent
+  features count as 0); output columns are ``probability`` and ``label``.
+
+With several calculators (comma-separated, or ``all``) output columns are
+prefixed ``<calculator>.``.  ``--workers N`` shards the work by row chunk and
+by calculator (each forest on its own, the cheap formulas together) across a
+process pool; every worker loads the models once, in its initializer, and
+receives only the input columns its calculators read.  Chunks are written in
+input order with at most ``2 × workers`` chunks in flight.
+
+``--keep`` copies input columns (e.g. a patient id) into the output.
+Throughput is printed to stderr at the end.
+"""
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from omm import engine, models, stream
+
+
+def formula_scorer(name):
+    spec = engine.get(name)
+
+    def score(chunk: pd.DataFrame) -> pd.DataFrame:
+        res = engine.score_records(spec, chunk)
+        out = {"index": res.index}
+        if spec.link == "logistic":
+            out["probability"] = res.probability
+        out["label"] = res.label
+        return pd.DataFrame(out)
+
+    return score
+
+
+def model_scorer(name):
+    calc = models.get(name)
+    forest = models.flat(name)
+    features = list(calc.features)
+
+    def score(chunk: pd.DataFrame) -> pd.DataFrame:
+        p = forest.predict_proba(stream.model_matrix(chunk, features))[:, 1]
+        label = (p >= 0.5) if calc.inclusive else (p > 0.5)
+        return pd.DataFrame({"probability": p, "label": label.astype(np.int8)})
+
+    return score
+
+
+def scorer(name: str):
+    """``chunk -> result DataFrame`` for a formula or model calculator."""
+    if name in engine.CALCULATORS:
+        return formula_scorer(name)
+    if name in models.NAMES:
+        return model_scorer(name)
+    known = ", ".join(sorted(engine.CALCULATORS) + list(models.NAMES))
+    raise KeyError(f"unknown calculator {name!r}; known: {known}")
+
+
+def calculator_names(spec: str) -> list:
+    """``"all"`` or a comma-separated list of calculator names."""
+    if spec == "all":
+        return sorted(engine.CALCULATORS) + list(models.NAMES)
+    return [n.strip() for n in spec.split(",") if n.strip()]
+
+
+def shard(names) -> list:
+    """Group calculators into tasks: one per forest, all formulas together."""
+    formulas = [n for n in names if n in engine.CALCULATORS]
+    return ([formulas] if formulas else []) + [[n] for n in names if n not in engine.CALCULATORS]
+
+
+def input_columns(names, columns) -> list:
+    """Columns of the input that the calculators in ``names`` read."""
+    wanted = set()
+    for name in names:
+        if name in engine.CALCULATORS:
+            wanted.update(engine.get(name).inputs)
+        else:
+            wanted.update(f.strip() for f in models.get(name).features)
+    return [c for c in columns if str(c).strip() in wanted]
+
+
+def score_group(scorers: dict, chunk: pd.DataFrame, prefix: bool) -> pd.DataFrame:
+    parts = []
+    for name, score in scorers.items():
+        res = score(chunk)
+        if prefix:
+            res.columns = [f"{name}.{c}" for c in res.columns]
+        parts.append(res)
+    return pd.concat(parts, axis=1)
+
+
+# ── Process-pool workers ──────────────────────────────────────────────────────
+
+_WORKER_SCORERS = {}
+
+
+def _init_worker(names):
+    for name in names:
+        _WORKER_SCORERS[name] = scorer(name)
+
+
+def _score_task(names, chunk, prefix):
+    return score_group({n: _WORKER_SCORERS[n] for n in names}, chunk, prefix)
+
+
+def run(calculator, source, target, chunk_rows=stream.CHUNK_ROWS, keep=(), in_fmt=None, out_fmt=None,
+        progress=None, workers=0):
+    """Score ``source`` into ``target``; returns (rows, seconds).
+
+    ``calculator`` is one name, a comma-separated list or ``"all"``;
+    ``workers > 0`` runs the scoring in a process pool.
+    """
+    names = calculator_names(calculator)
+    for name in names:
+        if name not in engine.CALCULATORS and name not in models.NAMES:
+            scorer(name)  # raises KeyError listing the known names
+    prefix = len(names) > 1
+    keep = list(keep)
+    t = time.perf_counter()
+    with stream.ChunkWriter(target, out_fmt) as writer:
+        for kept, parts, done in _score_chunks(stream.read_chunks(source, in_fmt, chunk_rows),
+                                               names, prefix, keep, workers):
+            writer.write(pd.concat([kept] + parts if keep else parts, axis=1))
+            if progress is not None:
+                progress(writer.rows, done)
+    return writer.rows, time.perf_counter() - t
+
+
+def _score_chunks(chunks, names, prefix, keep, workers):
+    """Yield ``(kept columns, [result frames], fraction done)`` per chunk, in input order."""
+    if not workers:
+        scorers = {n: scorer(n) for n in names}
+        for chunk, done in chunks:
+            yield chunk[keep].reset_index(drop=True), [score_group(scorers, chunk, prefix)], done
+        return
+
+    groups = shard(names)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(names,)) as pool:
+        pending = deque()
+        for chunk, done in chunks:
+            futures = [pool.submit(_score_task, g, chunk[input_columns(g, chunk.columns)], prefix)
+                       for g in groups]
+            pending.append((chunk[keep].reset_index(drop=True), futures, done))
+            while len(pending) > 2 * workers:
+                kept, futures, done = pending.popleft()
+                yield kept, [f.result() for f in futures], done
+        while pending:
+            kept, futures, done = pending.popleft()
+            yield kept, [f.result() for f in futures], done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m omm.score", description=__doc__.split("\n")[0])
+    parser.add_argument("--calculator", required=True,
+                        help="spec name (e.g. placenta), model (e.g. vpch_surg), a comma-separated list or 'all'")
+    parser.add_argument("--input", required=True, help="CSV or Parquet file")
+    parser.add_argument("--output", required=True, help="CSV or Parquet file")
+    parser.add_argument("--chunk-rows", type=int, default=stream.CHUNK_ROWS)
+    parser.add_argument("--keep", default="", help="comma-separated input columns to copy to the output")
+    parser.add_argument("--input-format", choices=stream.FORMATS)
+    parser.add_argument("--output-format", choices=stream.FORMATS)
+    parser.add_argument("--workers", type=int, default=0, help="process-pool size (0: score in this process)")
+    parser.add_argument("--quiet", action="store_true", help="no progress lines")
+    args = parser.parse_args(argv)
+
+    def progress(rows, done):
+        print(f"\r{rows:,} rows ({done:.0%})", end="", file=sys.stderr, flush=True)
+
+    try:
+        rows, seconds = run(args.calculator, args.input, args.output, args.chunk_rows,
+                            [c for c in args.keep.split(",") if c], args.input_format, args.output_format,
+                            None if args.quiet else progress, args.workers)
+    except (KeyError, ValueError) as e:
+        parser.error(e.args[0] if e.args else str(e))
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{rows:,} rows in {seconds:.2f} s ({rows / max(seconds, 1e-9):,.0f} rows/s) -> {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
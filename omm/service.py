@@ -0,0 +1,178 @@
+"""Headless HTTP inference service for every calculator.
+
+    uvicorn omm.service:app --workers 4
+
+Routes:
+
+* ``GET  /calculators``                — names, titles and expected fields;
+* ``POST /predict/<calculator>``       — body: one record ``{field: value}``;
+* ``POST /predict_batch/<calculator>`` — body: ``{"rows": [record, ...]}``;
+* ``GET  /stats``                      — micro-batching counters per model.
+
+Formula calculators take the raw inputs named in their spec
+(``omm/specs/<name>.json``); model calculators take ``{feature: value}`` with
+absent features treated as 0, as on the Streamlit pages.  All specs and model
+artifacts are loaded once at startup and shared read-only by all requests.
+
+Forests are evaluated as :class:`omm.forest.FlatForest` arrays.  Concurrent
+single-row requests to a model calculator are coalesced into one
+``predict_proba`` call (:class:`omm.batching.MicroBatcher`); tune with
+``OMM_MAX_BATCH_SIZE`` (default 64) and ``OMM_MAX_WAIT_MS`` (default 2).
+"""
+import contextlib
+import math
+import os
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from omm import engine, models
+from omm.batching import MicroBatcher
+
+MAX_BATCH_SIZE = int(os.environ.get("OMM_MAX_BATCH_SIZE", 64))
+MAX_WAIT_MS = float(os.environ.get("OMM_MAX_WAIT_MS", 2.0))
+
+
+class BadRequest(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def _clean(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _result(index, probability, label, labels):
+    label = int(label)
+    return {
+        "index": _clean(index),
+        "probability": _clean(probability),
+        "label": label,
+        "text": labels[label] if label >= 0 else None,
+    }
+
+
+async def _body(request: Request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise BadRequest(400, "request body must be JSON") from None
+
+
+def _rows(body) -> list:
+    rows = body.get("rows") if isinstance(body, dict) else body
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise BadRequest(400, 'expected {"rows": [{...}, ...]}')
+    return rows
+
+
+def _check_fields(rows, known, name):
+    unknown = sorted({k for r in rows for k in r} - set(known))
+    if unknown:
+        raise BadRequest(400, f"{name}: unknown fields {unknown}")
+
+
+def _lookup(request: Request, name: str):
+    state = request.app.state
+    if name in state.formulas:
+        return state.formulas[name], None, None
+    if name in state.models:
+        return None, state.models[name], state.batchers[name]
+    raise BadRequest(404, f"unknown calculator {name!r}")
+
+
+def _model_matrix(model: models.ModelCalculator, rows) -> np.ndarray:
+    try:
+        return models.layout(model.name).matrix(rows)
+    except (TypeError, ValueError):
+        raise BadRequest(400, f"{model.name}: all values must be numeric") from None
+
+
+async def _predict_model(model: models.ModelCalculator, batcher: MicroBatcher, rows) -> list:
+    X = _model_matrix(model, rows)
+    if len(X) == 1:
+        proba = (await batcher.submit(X[0]))[None, :]
+    else:
+        proba = await run_in_threadpool(models.flat(model.name).predict_proba, X)
+    p = proba[:, 1]
+    labels = (p >= 0.5) if model.inclusive else (p > 0.5)
+    return [_result(math.nan, pi, li, model.labels) for pi, li in zip(p, labels)]
+
+
+def _predict_formula(spec, rows) -> list:
+    columns = {k: [r.get(k) for r in rows] for k in spec.inputs}
+    try:
+        res = engine.score_records(spec, columns)
+    except (TypeError, ValueError) as e:
+        raise BadRequest(400, f"{spec.name}: {e}") from None
+    return [_result(*r, spec.labels) for r in zip(res.index, res.probability, res.label)]
+
+
+async def _predict_rows(request: Request, rows) -> list:
+    spec, model, batcher = _lookup(request, request.path_params["calculator"])
+    if spec is not None:
+        _check_fields(rows, spec.inputs, spec.name)
+        return _predict_formula(spec, rows)
+    _check_fields(rows, model.features, model.name)
+    return await _predict_model(model, batcher, rows)
+
+
+# ── Endpoints ─────────────────────────────────────────────────────────────────
+
+async def calculators(request: Request):
+    state = request.app.state
+    out = {name: {"kind": "formula", "title": s.title, "fields": list(s.inputs)}
+           for name, s in state.formulas.items()}
+    out.update({name: {"kind": "model", "title": m.title, "fields": list(m.features)}
+                for name, m in state.models.items()})
+    return JSONResponse(out)
+
+
+async def predict(request: Request):
+    body = await _body(request)
+    if not isinstance(body, dict):
+        raise BadRequest(400, "expected a JSON object {field: value}")
+    return JSONResponse((await _predict_rows(request, [body]))[0])
+
+
+async def predict_batch(request: Request):
+    rows = _rows(await _body(request))
+    return JSONResponse({"results": await _predict_rows(request, rows)})
+
+
+async def stats(request: Request):
+    return JSONResponse({name: b.stats() for name, b in request.app.state.batchers.items()})
+
+
+async def bad_request(request: Request, exc: BadRequest):
+    return JSONResponse({"detail": exc.detail}, status_code=exc.status)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    app.state.formulas = engine.CALCULATORS
+    app.state.models = models.load_all()
+    app.state.batchers = {
+        name: MicroBatcher(models.flat(name).predict_proba, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS)
+        for name in app.state.models
+    }
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route("/calculators", calculators, methods=["GET"]),
+        Route("/predict/{calculator}", predict, methods=["POST"]),
+        Route("/predict_batch/{calculator}", predict_batch, methods=["POST"]),
+        Route("/stats", stats, methods=["GET"]),
+    ],
+    exception_handlers={BadRequest: bad_request},
+    lifespan=lifespan,
+)
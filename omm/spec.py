@@ -0,0 +1,207 @@
+"""Declarative calculator specifications (``omm/specs/*.json``).
+
+A spec describes one closed-form calculator:
+
+* ``inputs``   — raw patient fields as the page asks for them
+  (``kind``: number / integer / binary / choice, optional ``min``/``max``/``options``);
+* ``features`` — model terms, each with a ``coef`` and an encoding of the raw
+  inputs: a source (``input`` — defaults to the feature name, ``diff``, ``min``
+  or ``bmi``) and at most one transform (``map`` + optional ``default``,
+  ``eq``, ``in``, ``lt``/``le``/``gt``/``ge``);
+* ``intercept``, ``link`` (identity / logistic), ``thresholds``, ``inclusive``
+  and one ``labels`` entry per class.
+
+This module is deliberately numpy-free so the pure-formula Streamlit pages
+can evaluate a single patient without paying for heavy imports; vectorized
+scoring lives in :mod:`omm.engine`.
+"""
+import json
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+SPEC_DIR = Path(__file__).resolve().parent / "specs"
+
+LINKS = ("identity", "logistic")
+SOURCES = ("input", "diff", "min", "bmi")
+COMPARISONS = {
+    "lt": lambda v, t: v < t,
+    "le": lambda v, t: v <= t,
+    "gt": lambda v, t: v > t,
+    "ge": lambda v, t: v >= t,
+}
+TRANSFORMS = ("map", "eq", "in", *COMPARISONS)
+
+
+class Result(NamedTuple):
+    index: float
+    probability: float  # NaN for identity-link calculators
+    label: int          # class number, -1 when an input is missing
+
+
+@dataclass(frozen=True, eq=False)
+class Spec:
+    name: str
+    title: str
+    source: str
+    inputs: dict
+    features: tuple
+    intercept: float
+    thresholds: tuple
+    labels: tuple
+    link: str = "identity"
+    inclusive: bool = False
+    notes: str = ""
+
+    def __post_init__(self):
+        if self.link not in LINKS:
+            raise ValueError(f"{self.name}: unknown link {self.link!r}")
+        if len(self.labels) != len(self.thresholds) + 1:
+            raise ValueError(f"{self.name}: need {len(self.thresholds) + 1} labels")
+        if list(self.thresholds) != sorted(self.thresholds):
+            raise ValueError(f"{self.name}: thresholds must be sorted")
+        for f in self.features:
+            if sum(k in f for k in SOURCES) > 1 or sum(k in f for k in TRANSFORMS) > 1:
+                raise ValueError(f"{self.name}.{f['name']}: ambiguous encoding")
+            for name in source_inputs(f):
+                if name not in self.inputs:
+                    raise ValueError(f"{self.name}.{f['name']}: unknown input {name!r}")
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Spec":
+        return cls(
+            name=d["name"],
+            title=d.get("title", d["name"]),
+            source=d.get("source", ""),
+            inputs=d["inputs"],
+            features=tuple(d["features"]),
+            intercept=float(d["intercept"]),
+            thresholds=tuple(float(t) for t in d["thresholds"]),
+            labels=tuple(d["labels"]),
+            link=d.get("link", "identity"),
+            inclusive=bool(d.get("inclusive", False)),
+            notes=d.get("notes", ""),
+        )
+
+    @property
+    def feature_names(self) -> tuple:
+        return tuple(f["name"] for f in self.features)
+
+    @property
+    def coefs(self) -> tuple:
+        return tuple(float(f["coef"]) for f in self.features)
+
+    def encode(self, record: dict) -> list:
+        """Map raw inputs (``{input_name: value}``) to the feature vector."""
+        return [encode_feature(f, record) for f in self.features]
+
+    def index(self, values) -> float:
+        """Linear predictor for an encoded feature vector (list or ``{feature: value}``)."""
+        if isinstance(values, dict):
+            values = [values[n] for n in self.feature_names]
+        return self.intercept + sum(c * float(v) for c, v in zip(self.coefs, values))
+
+    def classify(self, value: float) -> int:
+        if math.isnan(value):
+            return -1
+        side = bisect_right if self.inclusive else bisect_left
+        return side(self.thresholds, value)
+
+    def evaluate(self, record: dict) -> Result:
+        """Score one patient given raw inputs."""
+        return self.result(self.index(self.encode(record)))
+
+    def result(self, z: float) -> Result:
+        """Probability and class for a linear predictor value."""
+        if self.link == "logistic":
+            p = logistic(z)
+            return Result(z, p, self.classify(p))
+        return Result(z, math.nan, self.classify(z))
+
+
+def logistic(z: float) -> float:
+    if math.isnan(z):
+        return math.nan
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+def source_inputs(feature: dict) -> list:
+    """Raw input names a feature is computed from."""
+    for key in ("diff", "min", "bmi"):
+        if key in feature:
+            return list(feature[key])
+    return [feature.get("input", feature["name"])]
+
+
+def _missing(value) -> bool:
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def _number(value) -> float:
+    return math.nan if _missing(value) else float(value)
+
+
+def category(value):
+    """Normalise a categorical value: flags and numeric codes compare equal to their string keys.
+
+    ``True``/``False`` are the codes ``"1"``/``"0"``, ``2`` and ``2.0`` are ``"2"``.  The
+    vectorized encoder in :mod:`omm.engine` applies the same rule to whole columns.
+    """
+    if hasattr(value, "item") and not isinstance(value, str):
+        value = value.item()  # numpy scalar, e.g. a value taken from a DataFrame row
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else str(value)
+    return value
+
+
+def encode_feature(feature: dict, record: dict) -> float:
+    if "diff" in feature:
+        a, b = feature["diff"]
+        value = _number(record.get(a)) - _number(record.get(b))
+    elif "min" in feature:
+        a, b = (_number(record.get(n)) for n in feature["min"])
+        value = math.nan if math.isnan(a) or math.isnan(b) else min(a, b)
+    elif "bmi" in feature:
+        w, h = (_number(record.get(n)) for n in feature["bmi"])
+        value = w / (h / 100.0) ** 2 if h > 0 else math.nan
+    else:
+        value = record.get(feature.get("input", feature["name"]))
+
+    if "map" in feature:
+        value = category(value)
+        if value in feature["map"]:
+            return float(feature["map"][value])
+        return float(feature.get("default", math.nan))
+    if _missing(value):
+        return math.nan
+    if "eq" in feature:
+        return float(category(value) == feature["eq"])
+    if "in" in feature:
+        return float(category(value) in feature["in"])
+    value = _number(value)
+    for key, op in COMPARISONS.items():
+        if key in feature:
+            return math.nan if math.isnan(value) else float(op(value, feature[key]))
+    return value
+
+
+@lru_cache(maxsize=None)
+def load(name: str) -> Spec:
+    path = SPEC_DIR / f"{name}.json"
+    if not path.exists():
+        known = ", ".join(p.stem for p in sorted(SPEC_DIR.glob("*.json")))
+        raise KeyError(f"unknown calculator {name!r}; known: {known}")
+    with open(path, encoding="utf-8") as f:
+        return Spec.from_dict(json.load(f))
+
+
+def load_all() -> dict:
+    return {p.stem: load(p.stem) for p in sorted(SPEC_DIR.glob("*.json"))}
@@ -0,0 +1,109 @@
+"""Memory-mapped on-disk store for flattened forests.
+
+A store is a directory with one ``.npy`` file per :class:`~omm.forest.FlatForest`
+array (derived evaluation layouts included) and a ``manifest.json`` with the
+scalar metadata.  :func:`open_forest` maps the files read-only, so every
+process serving the same forest shares one copy of its pages through the OS
+page cache instead of unpickling a private copy.
+
+Opening reads only the manifest; each array is mapped when a prediction
+first uses it, and its pages are read from disk as the descent touches them.
+A forest that is opened but never used costs nothing beyond the manifest.
+
+    python -m omm.store          # (re)export every forest the calculators use
+"""
+import json
+import os
+
+import numpy as np
+
+from omm.forest import FlatForest
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+# store directory -> (pickled source artifact, key inside it or None for a bare estimator)
+FORESTS = {
+    "vpch/forest_surg": ("vpch/model_surg.pkl", None),
+    "vpch/forest_obs": ("vpch/model_obs.pkl", None),
+    "data/forest_surg": ("data/models.pkl", "clf_surg"),
+    "data/forest_wait": ("data/models.pkl", "clf_wait"),
+}
+
+
+def export(forest: FlatForest, directory, source: str = "") -> dict:
+    os.makedirs(directory, exist_ok=True)
+    arrays = {}
+    for name in FlatForest.ARRAYS + FlatForest.DERIVED:
+        a = np.ascontiguousarray(getattr(forest, name))
+        np.save(os.path.join(directory, f"{name}.npy"), a, allow_pickle=False)
+        arrays[name] = {"dtype": a.dtype.str, "shape": list(a.shape)}
+    manifest = {
+        "format": FORMAT_VERSION,
+        "source": source,
+        "n_trees": forest.n_trees,
+        "n_nodes": int(len(forest.feature)),
+        "max_depth": forest.max_depth,
+        "feature_names": forest.feature_names,
+        "arrays": arrays,
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    return manifest
+
+
+def read_manifest(directory) -> dict:
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{directory}: unsupported forest store format {manifest.get('format')!r}")
+    return manifest
+
+
+class MappedForest(FlatForest):
+    """:class:`~omm.forest.FlatForest` over a store directory; arrays load on first use."""
+
+    def __init__(self, directory, manifest: dict, mmap: bool = True):
+        self.directory = str(directory)
+        self.manifest = manifest
+        self.mmap_mode = "r" if mmap else None
+        self.max_depth = manifest["max_depth"]
+        self.feature_names = manifest["feature_names"]
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set yet, i.e. arrays not loaded so far
+        if name not in self.__dict__.get("manifest", {}).get("arrays", ()):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        a = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode=self.mmap_mode, allow_pickle=False)
+        setattr(self, name, a)
+        return a
+
+    @property
+    def n_trees(self) -> int:
+        return self.manifest["n_trees"]
+
+
+def open_forest(directory, mmap: bool = True) -> MappedForest:
+    """Open a store (reads the manifest only); arrays are read-only memory maps unless ``mmap=False``."""
+    return MappedForest(directory, read_manifest(directory), mmap)
+
+
+def export_all(root) -> list:
+    import joblib
+
+    written = []
+    for directory, (source, key) in FORESTS.items():
+        est = joblib.load(os.path.join(root, source))
+        if key is not None:
+            est = est[key]
+        export(FlatForest.from_sklearn(est), os.path.join(root, directory), source)
+        written.append(directory)
+    return written
+
+
+if __name__ == "__main__":
+    from omm.models import ROOT
+
+    for d in export_all(ROOT):
+        print(f"{d}/ ({read_manifest(ROOT / d)['n_nodes']} nodes)")
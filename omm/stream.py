@@ -0,0 +1,133 @@
+"""Chunked reading, scoring and writing of large CSV / Parquet files.
+
+Files are processed as a pipeline of fixed-size chunks so memory stays
+bounded by ``chunk_rows`` whatever the file size:
+
+    >>> with ChunkWriter("out.parquet") as out:
+    ...     for chunk, done in read_chunks("cohort.csv"):
+    ...         out.write(score(chunk))
+
+Sources and targets may be paths or binary file objects (e.g. a Streamlit
+upload, or a ``BytesIO`` for a download); the format comes from ``fmt`` or
+the file name.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+FORMATS = ("csv", "parquet")
+
+
+def file_format(source, fmt=None) -> str:
+    if fmt is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+        fmt = os.path.splitext(str(name))[1].lstrip(".").lower()
+        fmt = {"pq": "parquet", "txt": "csv"}.get(fmt, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported file format {fmt!r}; expected one of {FORMATS}")
+    return fmt
+
+
+def _size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    return getattr(source, "size", None)
+
+
+def read_chunks(source, fmt=None, chunk_rows: int = CHUNK_ROWS, columns=None):
+    """Yield ``(DataFrame, fraction_done)`` for consecutive chunks of ``source``.
+
+    For CSV the fraction is estimated from the bytes consumed so far.
+    """
+    fmt = file_format(source, fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(source)
+        total, done = max(pf.metadata.num_rows, 1), 0
+        for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+
+    size = _size(source)
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows, usecols=columns):
+            done = min(handle.tell() / size, 1.0) if size else float("nan")
+            yield chunk, done
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+class ChunkWriter:
+    """Append DataFrames to one CSV or Parquet file as they are produced."""
+
+    def __init__(self, target, fmt=None):
+        self.target = target
+        self.fmt = file_format(target, fmt)
+        self.rows = 0
+        self._parquet = None
+        self._csv = None
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.target, table.schema)
+            self._parquet.write_table(table)
+        else:
+            if self._csv is None:
+                own = isinstance(self.target, (str, os.PathLike))
+                self._csv = (open(self.target, "wb"), own) if own else (self.target, False)
+                header = True
+            else:
+                header = False
+            self._csv[0].write(df.to_csv(index=False, header=header).encode("utf-8"))
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self._csv is not None:
+            handle, own = self._csv
+            if own:
+                handle.close()
+            self._csv = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def match_columns(df: pd.DataFrame, features) -> dict:
+    """``{feature: column of df}``, tolerating surrounding whitespace in either name."""
+    by_stripped = {str(c).strip(): c for c in df.columns}
+    return {f: by_stripped[f.strip()] for f in features if f.strip() in by_stripped}
+
+
+def model_matrix(df: pd.DataFrame, features, columns=None, out=None) -> np.ndarray:
+    """(N, len(features)) float matrix; absent features and empty cells are 0, as on the pages.
+
+    Filled in place into ``out`` (at least N rows) when given, so a chunked
+    reader can reuse one buffer.
+    """
+    columns = match_columns(df, features) if columns is None else columns
+    if out is None:
+        X = np.zeros((len(df), len(features)), dtype=np.float64)
+    else:
+        X = out[:len(df)]
+        X.fill(0.0)
+    for j, f in enumerate(features):
+        if f in columns:
+            X[:, j] = pd.to_numeric(df[columns[f]], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    return X
@@ -0,0 +1,220 @@
+"""Precomputed lookup tables for calculators with small discrete input spaces.
+
+Some calculators ask only for choices and flags (the newborn scale: seven
+3-level radios, 2187 combinations; the sFGR risk: four flags and an Apgar
+score, 176).  :func:`build` enumerates every combination of a spec's discrete
+inputs — choices, binary flags and bounded integers — and stores the linear
+predictor of the features computed from them, so a page looks the answer up
+instead of encoding the record.  When a spec also has continuous inputs (the
+preeclampsia severity: three genotype flags plus lab values) the table holds
+the discrete part and the remaining features are added at lookup time.
+
+Tables live in ``omm/tables/<name>.json`` next to the specs, with a digest of
+the spec file; a missing or stale table is rebuilt in memory.  :func:`check`
+reports what the enumeration reveals about a spec: map keys that no page
+option can produce, options that fall through to a default, classes that no
+combination reaches and combinations of a fractional formula that sit
+exactly on a threshold.
+
+    python -m omm.tables            # (re)build the tables and print the checks
+    python -m omm.tables --check    # checks only; exit status 1 on findings
+
+Numpy-free, like :mod:`omm.spec`.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from omm.spec import SPEC_DIR, Result, Spec, category, encode_feature, load, load_all, source_inputs
+
+TABLE_DIR = Path(__file__).resolve().parent / "tables"
+TABLES = ("newborn_scale", "sfgr_risk", "preeclampsia_severity")
+MAX_ROWS = 100_000
+TIE_TOLERANCE = 1e-9
+
+
+def domain(meta: dict):
+    """Every value a discrete input can take, or None for a continuous one."""
+    kind = meta.get("kind", "number")
+    if kind == "choice":
+        return list(meta["options"])
+    if kind == "binary":
+        return [0, 1]
+    if kind == "integer" and "min" in meta and "max" in meta:
+        return list(range(int(meta["min"]), int(meta["max"]) + 1))
+    return None
+
+
+def digest(name: str) -> str:
+    return hashlib.sha256((SPEC_DIR / f"{name}.json").read_bytes()).hexdigest()[:16]
+
+
+@dataclass(frozen=True, eq=False)
+class Table:
+    """Linear predictor for every combination of a spec's discrete inputs (last input fastest)."""
+
+    spec: Spec
+    inputs: tuple
+    domains: tuple
+    index: tuple
+    complete: bool  # every feature comes from the discrete inputs
+
+    def __post_init__(self):
+        strides, stride = [], 1
+        for levels in reversed(self.domains):
+            strides.append(stride)
+            stride *= len(levels)
+        object.__setattr__(self, "_strides", tuple(reversed(strides)))
+        # keyed by both the raw and the normalised value: 1, 1.0 and True hit the raw key directly
+        object.__setattr__(self, "_levels", tuple({k: i for i, v in enumerate(levels) for k in (v, category(v))}
+                                                  for levels in self.domains))
+        object.__setattr__(self, "_rest", tuple(f for f in self.spec.features
+                                                if not set(source_inputs(f)) <= set(self.inputs)))
+
+    def __len__(self):
+        return len(self.index)
+
+    def position(self, record: dict):
+        """Row of ``record`` in the table, or None when a discrete input is outside its domain."""
+        pos = 0
+        for name, levels, stride in zip(self.inputs, self._levels, self._strides):
+            value = record.get(name)
+            i = levels.get(value)
+            if i is None:
+                i = levels.get(category(value))
+                if i is None:
+                    return None
+            pos += i * stride
+        return pos
+
+    def evaluate(self, record: dict) -> Result:
+        """Same as ``spec.evaluate(record)``, with the discrete part looked up."""
+        pos = self.position(record)
+        if pos is None:
+            return self.spec.evaluate(record)
+        z = self.index[pos]
+        for f in self._rest:
+            z += float(f["coef"]) * float(encode_feature(f, record))
+        return self.spec.result(z)
+
+    def to_dict(self) -> dict:
+        return {"spec": self.spec.name, "digest": digest(self.spec.name), "inputs": list(self.inputs),
+                "domains": [list(d) for d in self.domains], "complete": self.complete,
+                "index": list(self.index)}
+
+
+def build(spec: Spec) -> Table:
+    """Enumerate the discrete inputs of ``spec`` (raises ValueError when there are too many)."""
+    domains = {name: domain(meta) for name, meta in spec.inputs.items()}
+    inputs = tuple(name for name, d in domains.items() if d is not None)
+    if not inputs:
+        raise ValueError(f"{spec.name}: no discrete inputs")
+    n = math.prod(len(domains[name]) for name in inputs)
+    if n > MAX_ROWS:
+        raise ValueError(f"{spec.name}: {n} combinations, more than {MAX_ROWS}")
+    features = [f for f in spec.features if set(source_inputs(f)) <= set(inputs)]
+    index = []
+    for values in itertools.product(*(domains[name] for name in inputs)):
+        record = dict(zip(inputs, values))
+        index.append(spec.intercept + sum(float(f["coef"]) * float(encode_feature(f, record)) for f in features))
+    return Table(spec, inputs, tuple(tuple(domains[name]) for name in inputs), tuple(index),
+                 len(features) == len(spec.features))
+
+
+def save(table: Table) -> Path:
+    TABLE_DIR.mkdir(exist_ok=True)
+    path = TABLE_DIR / f"{table.spec.name}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(table.to_dict(), f, ensure_ascii=False)
+        f.write("\n")
+    return path
+
+
+@lru_cache(maxsize=None)
+def table(name: str) -> Table:
+    """Stored table of calculator ``name``; rebuilt in memory if absent or stale."""
+    spec = load(name)
+    path = TABLE_DIR / f"{name}.json"
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            d = json.load(f)
+        if d["digest"] == digest(name):
+            return Table(spec, tuple(d["inputs"]), tuple(tuple(v) for v in d["domains"]),
+                         tuple(d["index"]), d["complete"])
+    return build(spec)
+
+
+# ── Consistency checks ───────────────────────────────────────────────────────
+
+def check_spec(spec: Spec) -> list:
+    """Map keys that no option produces and options that no key matches."""
+    issues = []
+    for f in spec.features:
+        if "map" not in f:
+            continue
+        meta = spec.inputs.get(f.get("input", f["name"]), {})
+        if meta.get("kind") != "choice":
+            continue
+        options = {category(o) for o in meta["options"]}
+        for key in f["map"]:
+            if key not in options:
+                issues.append(f"{spec.name}.{f['name']}: map key {key!r} matches no option (unreachable)")
+        for option in meta["options"]:
+            if category(option) not in f["map"]:
+                fallback = f"default {f['default']}" if "default" in f else "no default: label -1"
+                issues.append(f"{spec.name}.{f['name']}: option {option!r} has no map key ({fallback})")
+    return issues
+
+
+def check_table(t: Table) -> list:
+    """Classes never reached, missing outcomes and exact threshold ties over the whole table."""
+    spec, issues = t.spec, []
+    if any(math.isnan(z) for z in t.index):
+        issues.append(f"{spec.name}: {sum(math.isnan(z) for z in t.index)} combinations have no outcome")
+    if not t.complete:
+        return issues
+    results = [spec.result(z) for z in t.index]
+    reached = {r.label for r in results}
+    for label, text in enumerate(spec.labels):
+        if label not in reached:
+            issues.append(f"{spec.name}: class {label} ({text!r}) is reached by no combination")
+    cuts = [math.log(t_ / (1 - t_)) if spec.link == "logistic" and 0 < t_ < 1 else t_ for t_ in spec.thresholds]
+    ties = sum(any(abs(z - c) < TIE_TOLERANCE for c in cuts) for z in t.index)
+    if ties and not all(z.is_integer() for z in t.index):  # ties are by design on a points scale
+        issues.append(f"{spec.name}: {ties} combinations sit exactly on a threshold")
+    return issues
+
+
+def check(name: str) -> list:
+    issues = check_spec(load(name))
+    if name in TABLES:
+        issues += check_table(table(name))
+    return issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m omm.tables", description=__doc__.split("\n")[0])
+    parser.add_argument("--check", action="store_true", help="only run the checks; exit 1 on findings")
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        for name in TABLES:
+            t = build(load(name))
+            kind = "complete" if t.complete else "discrete part"
+            print(f"{save(t).relative_to(TABLE_DIR.parent.parent)}: {len(t)} combinations ({kind})")
+        table.cache_clear()
+    issues = [issue for name in load_all() for issue in check(name)]
+    for issue in issues:
+        print(issue)
+    print(f"{len(issues)} finding(s)")
+    return 1 if args.check and issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
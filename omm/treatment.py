@@ -0,0 +1,143 @@
+"""Export of the treatment_choice artifacts.
+
+``data/models.pkl`` is the training output: both classifiers plus training
+matrices, AUCs and pandas importance Series.  Unpickling it imports sklearn
+and pandas and keeps everything resident, though the page only predicts.
+This tool splits it in two:
+
+* ``data/models_serving.pkl`` — feature names, top features, importances as
+  plain lists, the precomputed widget metadata and the training-cohort
+  partial-dependence curves of the top features, with the two forests in
+  the memory-mapped stores ``data/forest_surg`` / ``data/forest_wait``
+  (:mod:`omm.store`); loads with numpy only;
+* ``data/models_analysis.pkl`` — training matrices, labels, AUCs, class
+  counts and the original importance Series.
+
+    python -m omm.treatment              # export both artifacts
+    python -m omm.treatment bench        # cold start / RSS, before vs after
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+
+from omm import dependence, store
+from omm.forest import FlatForest, ForestGroup
+from omm.models import ANALYSIS, ROOT, SERVING, TREATMENT_FORESTS
+
+SOURCE = "data/models.pkl"
+ANALYSIS_KEYS = ("X_surg", "y_surg", "X_wait", "y_wait", "imp_surg", "imp_wait",
+                 "auc_surg", "auc_wait", "n_surg_pos", "n_surg_neg", "n_wait_pos", "n_wait_neg")
+
+
+def widget_spec(name: str, column) -> dict:
+    """Widget kind and range for one feature, from its training values."""
+    data = np.asarray(column, dtype=np.float64)
+    data = data[~np.isnan(data)]
+    mn, mx = float(data.min()), float(data.max())
+    values = sorted(float(v) for v in np.unique(data))
+    if set(values).issubset({0.0, 1.0}):
+        return {"name": name, "kind": "binary"}
+    if mx - mn <= 10 and len(values) <= 10:
+        return {"name": name, "kind": "discrete", "values": values}
+    return {"name": name, "kind": "continuous", "min": mn, "max": mx,
+            "median": float(np.median(data)), "step": float(max((mx - mn) / 100, 0.1))}
+
+
+def widget_index(models: dict) -> list:
+    """Widget specs for ``models["top_features"]``, pooled over both training sets."""
+    X = np.vstack([models["X_surg"], models["X_wait"]])
+    col = {n: i for i, n in enumerate(models["feature_names"])}
+    return [widget_spec(f, X[:, col[f]]) for f in models["top_features"]]
+
+
+def population_dependence(models: dict, forests: dict, widgets: list) -> list:
+    """PD curves of every widget feature over both training sets.
+
+    ``{"rows": training rows averaged over, "curves": [{column, grid, curve}]}``, curve (G, 2) surg/wait.
+    """
+    col = {n: i for i, n in enumerate(models["feature_names"])}
+    grids = [dependence.Grid(col[w["name"]], dependence.grid(w["kind"], w.get("min"), w.get("max"), w.get("values")))
+             for w in widgets]
+    X = np.vstack([models["X_surg"], models["X_wait"]]).astype(np.float64)
+    curves = dependence.partial_dependence(ForestGroup(forests), X, grids)
+    return {"rows": int(X.shape[0]),
+            "curves": [{"column": g.column, "grid": g.values.tolist(), "curve": c.tolist()}
+                       for g, c in zip(grids, curves)]}
+
+
+def serving_artifact(models: dict, forests: dict) -> dict:
+    names = list(models["feature_names"])
+    widgets = widget_index(models)
+    return {
+        "feature_names": names,
+        "top_features": list(models["top_features"]),
+        "imp_surg": [float(models["imp_surg"][f]) for f in names],
+        "imp_wait": [float(models["imp_wait"][f]) for f in names],
+        "widgets": widgets,
+        "dependence": population_dependence(models, forests, widgets),
+    }
+
+
+def analysis_artifact(models: dict) -> dict:
+    return {k: models[k] for k in ANALYSIS_KEYS}
+
+
+def export(source: str = SOURCE):
+    models = joblib.load(ROOT / source)
+    forests = {key: FlatForest.from_sklearn(models[f"clf_{key}"]) for key in TREATMENT_FORESTS}
+    for key, directory in TREATMENT_FORESTS.items():
+        store.export(forests[key], ROOT / directory, source)
+    joblib.dump(serving_artifact(models, forests), ROOT / SERVING)
+    joblib.dump(analysis_artifact(models), ROOT / ANALYSIS)
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+_PROBE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+t = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - t
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+LOADERS = {
+    "models.pkl (before)": f"import joblib; m = joblib.load({str(ROOT / SOURCE)!r})",
+    "models_serving.pkl (after)": "from omm.models import load_treatment; m = load_treatment()",
+}
+
+
+def bench(repeat: int = 5) -> dict:
+    """Median cold-start seconds and peak RSS (MB) of a fresh interpreter loading each artifact."""
+    out = {}
+    for name, load in LOADERS.items():
+        runs = []
+        for _ in range(repeat):
+            res = subprocess.run([sys.executable, "-c", _PROBE.format(root=str(ROOT), load=load)],
+                                 capture_output=True, text=True, check=True)
+            seconds, rss_kb = res.stdout.split()
+            runs.append((float(seconds), int(rss_kb) / 1024))
+        runs.sort()
+        out[name] = {"load_s": runs[len(runs) // 2][0], "rss_mb": max(r[1] for r in runs)}
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m omm.treatment", description=__doc__.split("\n")[0])
+    parser.add_argument("command", nargs="?", choices=("export", "bench"), default="export")
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        export()
+        for path in (SOURCE, SERVING, ANALYSIS):
+            print(f"{path:28s} {(ROOT / path).stat().st_size / 1024:8.0f} KB")
+    else:
+        print(json.dumps(bench(), ensure_ascii=False, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Two-input what-if grids for the closed-form calculators.
+
+:func:`grid` evaluates a calculator over every pair of values of two inputs,
+the other inputs fixed.  When the index is additive in the two inputs (both
+enter linearly and neither is a ``min`` partner of the other — every grid the
+pages draw) only the two axes are encoded and the (ny, nx) index is one
+broadcast sum, so a 1000×1000 grid costs a few vectorized passes; other
+pairs fall back to scoring the flattened grid with :mod:`omm.engine`.
+
+:func:`panel` draws the grid under a page as a heatmap (rendered to one PNG
+image, so a million cells do not travel as JSON) with the decision contour
+and the entered patient marked.  numpy and the engine are imported inside the
+functions, only once the map is switched on, so the pure-formula pages keep
+their quick first render.
+"""
+import base64
+import io
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from omm.boundary import breakpoints, cut, solvable
+from omm.spec import Spec
+
+MAX_POINTS = 1000
+CONTOUR_POINTS = 150
+RESOLUTIONS = (100, 200, 500, 1000)
+LOW, MID, HIGH = (49, 104, 176), (247, 247, 247), (200, 40, 40)
+
+
+@lru_cache(maxsize=None)
+def palette() -> list:
+    """256-entry diverging palette: blue below the first threshold, white on it, red above."""
+    import numpy as np
+
+    t = np.linspace(-1.0, 1.0, 256)[:, None]
+    low, mid, high = (np.array(c) for c in (LOW, MID, HIGH))
+    return np.where(t < 0, mid + (low - mid) * -t, mid + (high - mid) * t).astype(np.uint8).ravel().tolist()
+
+
+class Grid(NamedTuple):
+    x: "np.ndarray"      # (nx,) values of the first input
+    y: "np.ndarray"      # (ny,) values of the second input
+    index: "np.ndarray"  # (ny, nx) linear predictor
+    label: "np.ndarray"  # (ny, nx) class
+
+
+def additive(spec: Spec, x: str, y: str) -> bool:
+    return (solvable(spec, x) and solvable(spec, y)
+            and y not in breakpoints(spec, x) and x not in breakpoints(spec, y))
+
+
+def grid(spec: Spec, x: str, y: str, xs, ys, record: dict) -> Grid:
+    """Index and class over ``xs`` × ``ys`` (rows follow ``ys``), other inputs from ``record``."""
+    import numpy as np
+
+    from omm import engine
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if len(xs) > MAX_POINTS or len(ys) > MAX_POINTS:
+        raise ValueError(f"at most {MAX_POINTS} points per axis")
+    base = {k: np.asarray([v]) for k, v in record.items() if k in spec.inputs and v is not None}
+
+    def index(**columns):
+        n = max(len(c) for c in columns.values())
+        data = {k: np.repeat(v, n) for k, v in base.items()}
+        data.update(columns)
+        return engine.score_records(spec, data).index
+
+    if additive(spec, x, y):
+        x0, y0 = np.asarray([xs[0]]), np.asarray([ys[0]])
+        along_x = index(**{x: xs, y: np.repeat(y0, len(xs))})
+        along_y = index(**{x: np.repeat(x0, len(ys)), y: ys})
+        z = along_y[:, None] + (along_x - along_x[0])[None, :]
+    else:
+        gx, gy = np.meshgrid(xs, ys)
+        z = index(**{x: gx.ravel(), y: gy.ravel()}).reshape(len(ys), len(xs))
+    value = engine.logistic(z) if spec.link == "logistic" else z
+    return Grid(xs, ys, z, engine.classify(value, spec.thresholds, spec.inclusive))
+
+
+def image(spec: Spec, z) -> str:
+    """PNG data URI of the index, one palette byte per cell, top row = last y."""
+    import numpy as np
+    from PIL import Image
+
+    c = cut(spec, spec.thresholds[0])
+    d = z - c
+    span = np.nanmax(np.abs(d)) or 1.0
+    levels = np.clip(np.nan_to_num(d * (127.5 / span) + 127.5), 0, 255).astype(np.uint8)
+    im = Image.fromarray(np.ascontiguousarray(levels[::-1]), "P")
+    im.putpalette(palette())
+    buf = io.BytesIO()
+    im.save(buf, format="PNG", compress_level=1)
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def figure(spec: Spec, g: Grid, point=None, labels=("", "")):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    dx = (g.x[-1] - g.x[0]) / max(len(g.x) - 1, 1)
+    dy = (g.y[-1] - g.y[0]) / max(len(g.y) - 1, 1)
+    fig.add_layout_image(source=image(spec, g.index), xref="x", yref="y", x=g.x[0] - dx / 2, y=g.y[-1] + dy / 2,
+                         sizex=g.x[-1] - g.x[0] + dx, sizey=g.y[-1] - g.y[0] + dy,
+                         sizing="stretch", layer="below")
+    step_x = max(1, len(g.x) // CONTOUR_POINTS)
+    step_y = max(1, len(g.y) // CONTOUR_POINTS)
+    for t in spec.thresholds:
+        c = cut(spec, t)
+        fig.add_trace(go.Contour(x=g.x[::step_x], y=g.y[::step_y], z=g.index[::step_y, ::step_x],
+                                 contours=dict(start=c, end=c, size=1, coloring="lines"),
+                                 line=dict(color="black", width=2), showscale=False, hoverinfo="skip"))
+    if point is not None:
+        fig.add_trace(go.Scatter(x=[point[0]], y=[point[1]], mode="markers", hoverinfo="skip",
+                                 marker=dict(symbol="x", size=12, color="black")))
+    fig.update_layout(xaxis=dict(title=labels[0], range=[g.x[0] - dx / 2, g.x[-1] + dx / 2], showgrid=False),
+                      yaxis=dict(title=labels[1], range=[g.y[0] - dy / 2, g.y[-1] + dy / 2], showgrid=False),
+                      plot_bgcolor="white", showlegend=False, margin=dict(l=10, r=10, t=10, b=10), height=480)
+    return fig
+
+
+def panel(st, spec: Spec, x: str, y: str, record: dict, x_range, y_range, key: str):
+    """Expander with a what-if heatmap over two inputs; computed only when switched on."""
+    x_label = spec.inputs[x].get("label", x)
+    y_label = spec.inputs[y].get("label", y)
+    with st.expander("🗺️ Карта чувствительности", expanded=False):
+        if not st.toggle("Показать карту", key=f"{key}_on"):
+            return
+        xr = st.slider(x_label, *x_range, value=x_range, key=f"{key}_x")
+        yr = st.slider(y_label, *y_range, value=y_range, key=f"{key}_y")
+        n = st.select_slider("Точек по каждой оси", RESOLUTIONS, value=RESOLUTIONS[1], key=f"{key}_n")
+        import numpy as np
+
+        t = time.perf_counter()
+        g = grid(spec, x, y, np.linspace(*xr, n), np.linspace(*yr, n), record)
+        ms = (time.perf_counter() - t) * 1e3
+        point = (record[x], record[y]) if record.get(x) is not None and record.get(y) is not None else None
+        st.plotly_chart(figure(spec, g, point, (x_label, y_label)), use_container_width=True)
+        st.caption(f"Синий — «{spec.labels[0]}», красный — «{spec.labels[-1]}», линия — граница "
+                   f"решения, × — введённые значения; остальные показатели как введено. "
+                   f"Сетка {n}×{n}, расчёт {ms:.0f} мс.")
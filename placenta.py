@@ -2,9 +2,14 @@
 # Streamlit app: Placenta accreta risk index (D) calculator
 # Run: streamlit run app.py
 
-import math
 import streamlit as st
 
+from omm.spec import load
+from omm.uncertainty import panel as uncertainty_panel
+
+MODEL = load("placenta")
+SD = {"cervix_len_mm": 2.0}  # мм, погрешность трансвагинальной цервикометрии
+
 st.set_page_config(page_title="Индекс D: риск приращения плаценты", layout="centered")
 
 st.title("Прогноз риска приращения плаценты (индекс D)")
@@ -23,74 +28,42 @@ with col2:
     previa = st.selectbox("Предлежание плаценты", ["Нет", "Да"], index=0)
 
 st.subheader("Матка и рубцы")
-scar_count = st.selectbox("Количество рубцов на матке", ["0", "1", "2", "3+"], index=0)
+scar_count = st.selectbox("Количество рубцов на матке", MODEL.inputs["scar_count"]["options"], index=0)
 
 st.subheader("Расположение плаценты")
 placenta_location = st.selectbox(
     "Расположение плаценты относительно стенки матки",
-    ["Передняя стенка", "Задняя стенка", "Другое/не указано"],
+    MODEL.inputs["placenta_location"]["options"],
     index=2,
 )
 
 st.subheader("Шейка матки")
-# В формуле x7 входит с коэффициентом -0.106. Единицы в описании не указаны.
-# Здесь просим в миллиметрах (как часто в УЗИ). Если у вас сантиметры — умножьте на 10.
 cervix_len_mm = st.number_input("Длина шейки матки (мм)", min_value=0.0, max_value=80.0, value=35.0, step=0.5)
 
 st.divider()
 
-# ---- Feature engineering / mapping ----
-# BMI -> overweight
-height_m = height_cm / 100.0
-bmi = weight_kg / (height_m ** 2) if height_m > 0 else float("nan")
-
-# Interpretation choice (documented):
-# x1 = overweight (BMI >= 25)
-x1 = 1.0 if (not math.isnan(bmi) and bmi >= 25.0) else 0.0
-
-x2 = 1.0 if age < 30 else 0.0
-x3 = 1.0 if age > 40 else 0.0
-x4 = 1.0 if births > 3 else 0.0
-x5 = 1.0 if threat == "Да" else 0.0
-x6 = 1.0 if previa == "Да" else 0.0
-x7 = float(cervix_len_mm)
-
-x8 = 1.0 if placenta_location == "Передняя стенка" else 0.0
-x9 = 1.0 if placenta_location == "Задняя стенка" else 0.0
-
-scars = scar_count
-x10 = 0.0
-x11 = 0.0
-if scars in {"1", "2", "3+"}:
-    x10 = 1.0
-if scars == "2":
-    x11 = 1.0
-
-# x12: "средний возраст пациентки" is ambiguous for an individual.
-# Here we use patient's age (years) as a practical interpretation.
-x12 = float(age)
-
 # ---- Compute D ----
-d = (
-    0.161 * x1
-    - 6.55 * x2
-    + 5.383 * x3
-    + 1.339 * x4
-    + 1.195 * x5
-    - 2.158 * x6
-    - 0.106 * x7
-    + 2.163 * x8
-    - 2.305 * x9
-    + 4.064 * x10
-    + 2.092 * x11
-    - 0.617 * x12
-    + 24.423
-)
+# Feature engineering (BMI, age bands, scar count, ...) and its interpretation
+# are documented in omm/specs/placenta.json.
+record = {
+    "age": age,
+    "height_cm": height_cm,
+    "weight_kg": weight_kg,
+    "births": births,
+    "threat": int(threat == "Да"),
+    "previa": int(previa == "Да"),
+    "scar_count": scar_count,
+    "placenta_location": placenta_location,
+    "cervix_len_mm": cervix_len_mm,
+}
+d = MODEL.evaluate(record).index
 
 # ---- Output ----
 st.subheader("Результат")
 
-if d > 0:
+if MODEL.classify(d) == 1:
     st.error(f"Неблагоприятный прогноз (высокий риск). Индекс D = **{d:.3f}**")
 else:
     st.success(f"Благоприятный прогноз (низкий риск). Индекс D = **{d:.3f}**")
+
+uncertainty_panel(st, MODEL, record, SD, key="placenta_sd")
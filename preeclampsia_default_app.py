@@ -1,5 +1,11 @@
 import streamlit as st
 
+from omm.spec import load
+from omm.tables import table
+
+RISK = load("preeclampsia_risk")
+SEVERITY = table("preeclampsia_severity")  # genotype part looked up, omm/tables/preeclampsia_severity.json
+
 st.set_page_config(
     page_title="Прогноз преэклампсии",
     layout="centered",
@@ -20,26 +26,23 @@ with tabs[0]:
         albumin = st.number_input("Уровень альбумина (г/л)", format="%.2f")
         apoe_option = st.radio(
             "Полиморфизм АроЕ",
-            ("CC", "CT", "TT"),
+            RISK.inputs["apoe"]["options"],
         )
         cetp_option = st.radio(
             "Полиморфизм СЕТР",
-            ("GG", "GA", "AA"),
+            RISK.inputs["cetp"]["options"],
         )
         submit1 = st.form_submit_button("Расчет")
     if submit1:
-        apoe_map = {"CC": 0, "CT": 1, "TT": 2}
-        cetp_map = {"GG": 0, "GA": 1, "AA": 2}
-        X = (
-            1.2
-            - 0.17 * bmi
-            + 3.9 * (1 if fgr else 0)
-            - 0.19 * albumin
-            + 0.66 * alt
-            - 0.93 * apoe_map[apoe_option]
-            - 0.32 * cetp_map[cetp_option]
-        )
-        if X >= 0:
+        res = RISK.evaluate({
+            "bmi": bmi,
+            "fgr": int(fgr),
+            "ast": alt,
+            "albumin": albumin,
+            "apoe": apoe_option,
+            "cetp": cetp_option,
+        })
+        if res.label == 1:
             st.error("ВЫСОКИЙ РИСК\nреализации преэклампсии")
         else:
             st.success("НИЗКИЙ РИСК\nреализации преэклампсии")
@@ -60,16 +63,15 @@ with tabs[1]:
         apoA = st.number_input("Уровень ApoA (г/л)", format="%.2f")
         submit2 = st.form_submit_button("Расчет")
     if submit2:
-        D = (
-            2.438 * (1 if apoe else 0)
-            + 5.643 * (1 if cetp else 0)
-            + 2.9 * (1 if lpl else 0)
-            - 0.14 * weight_gain
-            - 0.64 * cholesterol
-            - 2.93 * apoA
-            + 7.21
-        )
-        if D <= 0:
+        res = SEVERITY.evaluate({
+            "apoe_c": int(apoe),
+            "cetp_a": int(cetp),
+            "lpl_g": int(lpl),
+            "weight_gain": weight_gain,
+            "cholesterol": cholesterol,
+            "apoa": apoA,
+        })
+        if res.label == 0:
             st.error("ТЯЖЕЛАЯ ФОРМА\nПРЕЭКЛАМПСИИ")
         else:
             st.success("УМЕРЕННАЯ ФОРМА\nПРЕЭКЛАМПСИИ")
@@ -1,5 +1,9 @@
 import streamlit as st
 
+from omm.spec import load
+
+MODEL = load("preeclampsia_new")
+
 st.set_page_config(page_title="Оценка риска", page_icon="🩺", layout="centered")
 
 st.title("🩺 Оценка риска")
@@ -20,17 +24,15 @@ st.markdown("")
 
 # Кнопка расчёта финального результата
 if st.button("Рассчитать риск"):
-    # Внутренние расчёты (пользователь их не видит)
-    x1 = 1 if hypodynamia else 0
-    x2 = 1 if ckd else 0
-    x3 = 1 if chronic_ht_prev_preg else 0
-    x4 = float(systolic)
-    x5 = float(diastolic)
-    x6 = 1 if diastolic > 100 else 0
-
-    # Модель (скрыта от пользователя в интерфейсе)
-    D = 1.61 * x1 + 1.05 * x2 - 1.62 * x3 - 0.11 * x4 + 0.09 * x5 + 3.13 * x6 + 3.73
-    risk_high = D >= -1.36
+    # Модель (скрыта от пользователя в интерфейсе): omm/specs/preeclampsia_new.json
+    res = MODEL.evaluate({
+        "hypodynamia": int(hypodynamia),
+        "ckd": int(ckd),
+        "chronic_hypertension": int(chronic_ht_prev_preg),
+        "systolic": systolic,
+        "diastolic": diastolic,
+    })
+    risk_high = res.label == 1
 
     # Отображаем только финальную интерпретацию, без параметров модели
     if risk_high:
@@ -1,7 +1,13 @@
 # app.py
-import math
 import streamlit as st
 
+from omm.boundary import panel
+from omm.spec import load
+from omm.uncertainty import panel as uncertainty_panel
+
+MODEL = load("sfft")
+SD = {"ktr1": 1.5, "ktr2": 1.5}  # мм, межисследовательская погрешность КТР
+
 st.set_page_config(page_title="СФФТ: калькулятор риска", page_icon="🧮", layout="centered")
 
 st.title("🧮 Прогноз СФФТ по УЗ-признакам")
@@ -13,7 +19,6 @@ with st.form("inputs"):
 
     ktr1 = st.number_input("КТР1 (мм)", min_value=0.0, value=50.0, step=0.1)
     ktr2 = st.number_input("КТР2 (мм)", min_value=0.0, value=50.0, step=0.1)
-    ktr_diff = ktr1 - ktr2
 
     pi2 = st.selectbox("ПИ 2-го плода более 95%", options=[0, 1], format_func=lambda x: "Да" if x == 1 else "Нет")
 
@@ -22,17 +27,21 @@ with st.form("inputs"):
     submitted = st.form_submit_button("Рассчитать")
 
 if submitted:
-    # Coefficients from the description
-    F = 2.07 * ph + 0.08 * ktr_diff + 4.45 * pi2 + 2.12 * tvp_gt3 - 7.52
-    P = 1.0 / (1.0 + math.exp(-F))
+    # Coefficients from the description: omm/specs/sfft.json
+    record = {"chorion_previa": ph, "ktr1": ktr1, "ktr2": ktr2, "pi2_gt_95": pi2, "tvp_gt_3": tvp_gt3}
+    res = MODEL.evaluate(record)
+    st.session_state["sfft_record"] = record
 
     st.markdown("---")
     st.subheader("Результат")
 
     col1, col2 = st.columns(2)
 
-    if P < 0.25:
+    if res.label == 0:
         st.success("Классификация: **не СФФТ** ")
     else:
         st.error("Классификация: **СФФТ** ")
+    panel(st, MODEL, record)
 
+if "sfft_record" in st.session_state:
+    uncertainty_panel(st, MODEL, st.session_state["sfft_record"], SD, key="sfft_sd")
@@ -1,6 +1,12 @@
 # app.py
 import streamlit as st
-import numpy as np
+
+from omm.spec import load
+from omm.uncertainty import panel as uncertainty_panel
+
+WI = load("shunt_wi")
+DI = load("shunt_di")
+SD = {"parenchyma": 0.5}  # мм, погрешность измерения толщины паренхимы
 
 st.set_page_config(page_title="Прогноз & Шунтирование", page_icon="🍼")
 st.header("СПОСОБ ОПРЕДЕЛЕНИЯ ПРОГНОЗА И НЕОБХОДИМОСТИ ВНУТРИУТРОБНОГО НЕФРОАМНИАЛЬНОГО ШУНТИРОВАНИЯ У ПЛОДОВ С ВРОЖДЕННЫМИ ОБСТРУКТИВНЫМИ УРОПАТИЯМИ")
@@ -28,20 +34,20 @@ with c2:
     x6 = st.text_input("Индекс потока FI (Х6)")
 
 def calc_wi():
-    vals = [
-        int(x1),
-        int(x2),
-        num_or_none(x3),
-        num_or_none(x4),
-        num_or_none(x5),
-        num_or_none(x6),
-    ]
-    if None in vals[2:]:
+    vals = {
+        "bilateral": int(x1),
+        "male": int(x2),
+        "kidney_length": num_or_none(x3),
+        "parenchyma": num_or_none(x4),
+        "vi": num_or_none(x5),
+        "fi": num_or_none(x6),
+    }
+    if None in vals.values():
         st.session_state.wi_error = "Заполните все числовые поля (Х3-Х6)."
         return
-    b = np.array([-0.292, -1.551, -0.054, 0.221, 0.065, 0.416])
-    wi = float(np.dot(b, vals) - 4.673)
+    wi = WI.evaluate(vals).index
     st.session_state.wi = wi          # сохраняем
+    st.session_state.wi_record = vals
     st.session_state.wi_error = None
 
 st.button("Рассчитать WI", on_click=calc_wi)
@@ -52,15 +58,16 @@ if "wi_error" in st.session_state and st.session_state.wi_error:
 elif "wi" in st.session_state:
     wi = st.session_state.wi
     st.subheader(f"WI = {wi:.3f}")
-    if wi < 0:
+    if WI.classify(wi) == 0:
         st.error("Неблагоприятный прогноз")
     else:
         st.success("Благоприятный прогноз – можно перейти ко 2-му этапу")
+    uncertainty_panel(st, WI, st.session_state.wi_record, SD, key="wi_sd")
 
 # ────────────────────────────────────────
 # II. Диагностический индекс (DI)
 # ────────────────────────────────────────
-if st.session_state.get("wi", -1) >= 0:
+if "wi" in st.session_state and WI.classify(st.session_state.wi) == 1:
     st.header("II этап. Способ определения необходимости нефроамниального шунтирования у плодов с обструктивными уропатиями.")
 
     d1, d2 = st.columns(2)
@@ -74,20 +81,20 @@ if st.session_state.get("wi", -1) >= 0:
         y6 = st.checkbox("Кистозная дисплазия (Y6)")
 
     def calc_di():
-        vals = [
-            num_or_none(y1),
-            num_or_none(y2),
-            num_or_none(y3),
-            num_or_none(y4),
-            int(y5),
-            int(y6),
-        ]
-        if None in vals[:4]:
+        vals = {
+            "kidney_length": num_or_none(y1),
+            "parenchyma": num_or_none(y2),
+            "vi": num_or_none(y3),
+            "fi": num_or_none(y4),
+            "kidney_cyst": int(y5),
+            "cystic_dysplasia": int(y6),
+        }
+        if None in vals.values():
             st.session_state.di_error = "Заполните все числовые поля (Y1-Y4)."
             return
-        a = np.array([0.017, 0.222, 0.565, -0.388, 5.589, 7.005])
-        di = float(np.dot(a, vals) - 0.463)
+        di = DI.evaluate(vals).index
         st.session_state.di = di
+        st.session_state.di_record = vals
         st.session_state.di_error = None
 
     st.button("Рассчитать DI", on_click=calc_di)
@@ -97,7 +104,8 @@ if st.session_state.get("wi", -1) >= 0:
     elif "di" in st.session_state:
         di = st.session_state.di
         st.subheader(f"DI = {di:.3f}")
-        if di < 0:
+        if DI.classify(di) == 0:
             st.error("Необходимо провести нефроамниальное шунтирование")
         else:
             st.success("Показаний для шунтирования нет")
+        uncertainty_panel(st, DI, st.session_state.di_record, SD, key="di_sd")
@@ -0,0 +1,55 @@
+"""All OMM calculators in one Streamlit process.
+
+    streamlit run streamlit_app.py
+
+Every calculator script is registered as a page and executed only when it is
+opened, so sklearn, plotly, pandas and the model artifacts are imported or
+loaded on the first visit to a page that needs them (and then shared by all
+sessions through ``st.cache_resource`` and the module cache).  The scripts
+still run standalone with ``streamlit run <app>.py``.
+"""
+import streamlit as st
+
+PAGES = {
+    "Беременность": [
+        ("antenat.py", "Антенатальная гибель плода", "🕯️"),
+        ("preeclampsia_default_app.py", "Преэклампсия: риск и тяжесть", "🩺"),
+        ("preeklampsy_new.py", "Преэклампсия: оценка риска", "🩺"),
+        ("superimposed_preeclampsiya.py", "Присоединение преэклампсии при ХАГ", "🩺"),
+        ("app_preclampsiya.py", "Преэклампсия при ГСД после ВРТ", "🩺"),
+        ("app-macrosomia.py", "Макросомия при ГСД после ВРТ", "⚖️"),
+        ("app_fetal.py", "ГСД: риск ЗРП", "📉"),
+        ("placenta.py", "Приращение плаценты (индекс D)", "🧬"),
+        ("app_lung.py", "Зрелость лёгких плода", "🫁"),
+        ("shunt_app.py", "Нефроамниальное шунтирование", "🍼"),
+    ],
+    "Монохориальная двойня": [
+        ("sfft_app.py", "СФФТ: калькулятор риска", "🧮"),
+        ("app_risk.py", "Неонатальный риск после ФФТС", "👶"),
+        ("monohor_app.py", "Неонатальный риск при sFGR", "👶"),
+        ("szpr_app.py", "ССЗРП МХДА", "🍼"),
+    ],
+    "Новорождённые": [
+        ("app_newborn_scale.py", "Шкала ОММ.MedNeo", "🩻"),
+    ],
+    "Гинекология и репродукция": [
+        ("app_response.py", "Наступление беременности", "🤰"),
+        ("app.py", "Рецидив эндометриоза (клиника, микробиота)", "🔁"),
+        ("app_1.py", "Рецидив эндометриоза (ИГХ)", "🔁"),
+        ("treatment_choice.py", "Выбор тактики лечения", "🏥"),
+        ("vpch/app.py", "ВПЧ: прогноз исходов", "🔬"),
+        ("app_incontinence.py", "Недержание мочи: выбор операции", "💧"),
+        ("app_urodinamics.py", "Тазовые дисфункции после родов", "💧"),
+    ],
+}
+
+
+def url_path(script: str) -> str:
+    return script.removesuffix(".py").replace("/", "_").replace("-", "_")
+
+
+pages = {
+    section: [st.Page(script, title=title, icon=icon, url_path=url_path(script)) for script, title, icon in entries]
+    for section, entries in PAGES.items()
+}
+st.navigation(pages).run()
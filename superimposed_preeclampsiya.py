@@ -1,19 +1,18 @@
 # app.py
 import streamlit as st
-import pandas as pd
+
+from omm.spec import load
 
 st.set_page_config(page_title="OMM SUPERIMPOSED PREECLAMPSIA PREDICT",
                    page_icon="🩺", layout="centered")
 
-COEFFS = {"X1": 2.45, "X2": -4.63, "X3": 2.64, "X4": 4.22, "X5": -57.11, "X6": 117.62}
-INTERCEPT = -3.96
+MODEL = load("superimposed_preeclampsia")
 
 def compute_D(x1, x2, x3, x4, x5, x6):
-    return (COEFFS["X1"]*x1 + COEFFS["X2"]*x2 + COEFFS["X3"]*x3 + COEFFS["X4"]*x4
-            + COEFFS["X5"]*x5 + COEFFS["X6"]*x6 + INTERCEPT)
+    return MODEL.index([x1, x2, x3, x4, x5, x6])
 
 def risk_label(D):
-    return "Высокий риск" if D > 0 else "Низкий риск"
+    return MODEL.labels[MODEL.classify(D)]
 
 def parse_float(s: str):
     """Return float value from text (supports comma decimal), or None if blank/invalid."""
@@ -64,7 +63,7 @@ if st.button("Рассчитать"):
 # Показываем результат, если он есть
 res = st.session_state.last_result
 if res is not None:
-    if res["D"] > 0:
+    if MODEL.classify(res["D"]) == 1:
         st.error(f"**{res['label']}**")
     else:
         st.success(f"**{res['label']}**")
@@ -1,5 +1,12 @@
 import streamlit as st
-import numpy as np
+
+from omm.boundary import panel
+from omm.spec import load
+from omm.uncertainty import panel as uncertainty_panel
+
+RISK = load("szpr_risk")
+OUTCOME = load("szpr_outcome")
+SD = {"ktr1": 1.5, "ktr2": 1.5, "tvp1": 0.15, "tvp2": 0.15}  # мм, погрешность УЗ-измерений
 
 st.set_page_config(page_title="OMM – прогноз ССЗРП МХДА", page_icon="🍼")
 
@@ -51,17 +58,23 @@ if st.button("Рассчитать риск ССЗРП"):
         st.stop()
 
     k1, k2, v1, v2 = vals
-    Z = 2.75 + 0.20 * (k1 - k2) + 0.71 * (v1 - v2) - 3.75 * min(v1, v2) + 2.27 * tkr
-    prob = 1 / (1 + np.exp(-Z))
+    record = {"ktr1": k1, "ktr2": k2, "tvp1": v1, "tvp2": v2, "tricuspid_regurgitation": tkr}
+    res = RISK.evaluate(record)
+    prob = res.probability
 
     st.session_state["prob"] = prob          # сохраняем для второго этапа
-    st.session_state["risk_high"] = prob > 0.15
+    st.session_state["risk_high"] = res.label == 1
+    st.session_state["szpr_record"] = record
 
     st.write(f"Вероятность ССЗРП: **{prob:.3f}**")
     if st.session_state["risk_high"]:
         st.error("⚠️ Высокий риск ССЗРП")
     else:
         st.success("Низкий риск ССЗРП")
+    panel(st, RISK, record)
+
+if "szpr_record" in st.session_state:
+    uncertainty_panel(st, RISK, st.session_state["szpr_record"], SD, key="szpr_sd")
 
 # ────────────────── 2-й ЭТАП ──────────────────
 if st.session_state.get("risk_high"):
@@ -75,7 +88,7 @@ if st.session_state.get("risk_high"):
             st.warning("⚠️ Введите числовое значение ПИ.")
             st.stop()
 
-        if pi_val > 1.3:
+        if OUTCOME.evaluate({"ductus_venosus_pi": pi_val}).label == 1:
             st.error(
                 "Прогноз: вероятна гибель одного/двух плодов.\n\n"
                 "👉 Рассмотрите коагуляцию сосудов пуповины меньшего плода."
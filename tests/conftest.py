@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+
+def _draw(meta: dict, n: int, rng) -> list:
+    kind = meta.get("kind", "number")
+    if kind == "binary":
+        return rng.integers(0, 2, n).tolist()
+    if kind == "choice":
+        return [meta["options"][i] for i in rng.integers(0, len(meta["options"]), n)]
+    low, high = meta.get("min", 0.0), meta.get("max", meta.get("min", 0.0) + 100.0)
+    if kind == "integer":
+        return rng.integers(int(low), int(high) + 1, n).tolist()
+    return rng.uniform(low, high, n).tolist()
+
+
+@pytest.fixture
+def records():
+    """``records(spec, n)``: n random raw records within the spec's input ranges (seeded)."""
+    def make(spec, n=200, seed=0):
+        rng = np.random.default_rng(seed)
+        columns = {name: _draw(meta, n, rng) for name, meta in spec.inputs.items()}
+        return [{name: col[i] for name, col in columns.items()} for i in range(n)]
+    return make
@@ -0,0 +1,41 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from omm.batching import MicroBatcher
+
+
+def test_rows_are_coalesced_and_answered_in_order():
+    async def main():
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X * 2
+
+        batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=50)
+        out = await asyncio.gather(*(batcher.submit([i]) for i in range(10)))
+        return out, calls, batcher
+
+    out, calls, batcher = asyncio.run(main())
+    assert [float(r[0]) for r in out] == [2.0 * i for i in range(10)]
+    assert calls == [4, 4, 2]
+    assert batcher.stats() == {"batches": 3, "rows": 10, "mean_batch_size": 10 / 3}
+    assert not batcher._tasks
+
+
+def test_errors_reach_every_caller_of_the_batch():
+    async def main():
+        def predict(X):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=1)
+        return await asyncio.gather(*(batcher.submit(np.zeros(2)) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(e, RuntimeError) for e in asyncio.run(main()))
+
+
+def test_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda X: X, max_batch_size=0)
@@ -0,0 +1,48 @@
+import math
+
+import pytest
+
+from omm import boundary, engine
+
+CASES = [(name, input_name) for name, spec in sorted(engine.CALCULATORS.items())
+         for input_name in boundary.continuous_inputs(spec)]
+
+
+def _step(value):
+    return 1e-7 * max(1.0, abs(value))
+
+
+@pytest.mark.parametrize("name, input_name", CASES)
+def test_boundaries_flip_the_label(name, input_name, records):
+    spec = engine.get(name)
+    found = 0
+    for record in records(spec, n=30):
+        for b in boundary.solve(spec, input_name, record):
+            h = _step(b.value)
+            assert spec.evaluate(dict(record, **{input_name: b.value - h})).label == b.below
+            assert spec.evaluate(dict(record, **{input_name: b.value + h})).label == b.above
+            found += 1
+    assert found
+
+
+@pytest.mark.parametrize("name, input_name", CASES)
+def test_batch_solver_returns_the_nearest_boundary(name, input_name, records):
+    spec = engine.get(name)
+    rows = records(spec, n=30, seed=1)
+    batch = boundary.solve_records(spec, input_name, {k: [r[k] for r in rows] for k in spec.inputs})
+    for i, record in enumerate(rows):
+        current = record[input_name]
+        for t in spec.thresholds:
+            values = [b.value for b in boundary.solve(spec, input_name, record) if b.threshold == t]
+            if not values:
+                assert math.isnan(batch[t][i])
+                continue
+            nearest = min(values, key=lambda v: abs(v - current))
+            assert batch[t][i] == pytest.approx(nearest, rel=1e-9, abs=1e-9)
+
+
+def test_inputs_outside_the_linear_part_are_rejected():
+    spec = engine.get("newborn_scale")
+    name = next(iter(spec.inputs))
+    with pytest.raises(ValueError, match="not linear"):
+        boundary.solve(spec, name, {})
@@ -0,0 +1,53 @@
+import numpy as np
+
+from omm import dependence
+from omm.models import TREATMENT_FORESTS, load_forest, load_treatment_pair, load_vpch
+
+
+def _grids(forest, columns=(0, 3, 7)):
+    return [dependence.Grid(c, dependence.grid("continuous", 0, 3, points=7)) for c in columns]
+
+
+def test_ice_and_pd_match_direct_predictions():
+    forest = load_vpch("surg")
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 3, (15, forest.n_features)).astype(np.float64)
+    grids = _grids(forest)
+    ice = dependence.ice(forest, X[0], grids)
+    pd = dependence.partial_dependence(forest, X, grids)
+    for g, curve, mean in zip(grids, ice, pd):
+        for k, v in enumerate(g.values):
+            Xv = X.copy()
+            Xv[:, g.column] = v
+            p = forest.predict_proba(Xv)[:, 1]
+            assert curve[k] == p[0]
+            np.testing.assert_allclose(mean[k], p.mean(), rtol=0, atol=1e-12)
+
+
+def test_group_curves_match_members():
+    pair = load_treatment_pair()
+    members = [load_forest(d) for d in TREATMENT_FORESTS.values()]
+    x = np.random.default_rng(1).random(pair.forest.n_features)
+    grids = _grids(pair.forest)
+    for j, forest in enumerate(members):
+        for joint, single in zip(dependence.ice(pair, x, grids), dependence.ice(forest, x, grids)):
+            np.testing.assert_allclose(joint[:, j], single, rtol=0, atol=1e-12)
+
+
+def _recursion(forest, column, value, node):
+    """sklearn's ``recursion`` PD of one tree: follow splits on ``column``, average the rest by cover."""
+    left, right = forest.left[node], forest.right[node]
+    if left == node:
+        return forest.value[node, 1]
+    if forest.feature[node] == column:
+        return _recursion(forest, column, value, left if np.float32(value) <= forest.threshold32[node] else right)
+    return (forest.cover[left] * _recursion(forest, column, value, left)
+            + forest.cover[right] * _recursion(forest, column, value, right)) / forest.cover[node]
+
+
+def test_cover_dependence_matches_the_recursion():
+    forest = load_vpch("obs")
+    grids = _grids(forest, columns=tuple(int(forest.feature[r]) for r in forest.roots[:3]))
+    for g, curve in zip(grids, dependence.cover_dependence(forest, grids)):
+        expected = [np.mean([_recursion(forest, g.column, v, r) for r in forest.roots]) for v in g.values]
+        np.testing.assert_allclose(curve, expected, rtol=0, atol=1e-12)
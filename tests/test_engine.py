@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from omm import engine
+from omm.spec import Spec
+
+FLAGS = Spec.from_dict({
+    "name": "flags",
+    "inputs": {"a": {"kind": "binary"}, "b": {"kind": "binary"}, "c": {"kind": "binary"}},
+    "features": [
+        {"name": "a_map", "input": "a", "map": {"1": 2.0, "0": -1.0}, "default": 5.0, "coef": 1.0},
+        {"name": "b_eq", "input": "b", "eq": "1", "coef": 0.5},
+        {"name": "c_in", "input": "c", "in": ["1", "2"], "coef": 0.25},
+        {"name": "a", "coef": 0.125},
+    ],
+    "intercept": 0.0,
+    "thresholds": [1.0],
+    "labels": ["low", "high"],
+})
+
+
+def _check_columns(spec, columns):
+    scores = engine.score_records(spec, columns)
+    n = len(next(iter(columns.values())))
+    for i in range(n):
+        expected = spec.evaluate({k: v[i] for k, v in columns.items()})
+        np.testing.assert_equal(scores.index[i], expected.index)
+        assert scores.label[i] == expected.label
+
+
+def test_bool_columns_match_evaluate():
+    flags = np.array([True, False, True, False])
+    _check_columns(FLAGS, {"a": flags, "b": ~flags, "c": flags})
+
+
+def test_mixed_object_columns_match_evaluate():
+    values = np.array([True, False, 1, 0, 1.0, "1", "0", None, 2, 0.0], dtype=object)
+    codes = np.array([True, "2", 2.0, "x", None, 1, False, "1", 0, 3], dtype=object)
+    _check_columns(FLAGS, {"a": values, "b": values, "c": codes})
+
+
+def _columns(rows, spec):
+    return {k: [r.get(k) for r in rows] for k in spec.inputs}
+
+
+@pytest.mark.parametrize("name", sorted(engine.CALCULATORS))
+def test_score_records_matches_evaluate(name, records):
+    spec = engine.get(name)
+    rows = records(spec)
+    rows[0] = dict(rows[0], **{next(iter(spec.inputs)): None})  # a missing input scores NaN in both
+    scores = engine.score_records(spec, _columns(rows, spec))
+    for i, row in enumerate(rows):
+        expected = spec.evaluate(row)
+        np.testing.assert_allclose(scores.index[i], expected.index, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(scores.probability[i], expected.probability, rtol=1e-12, atol=1e-15)
+        assert scores.label[i] == expected.label
+
+
+def test_compiled_matches_single_calculators(records):
+    compiled = engine.compile_specs()
+    rows = [r for name in compiled.names for r in records(engine.get(name), n=20)]
+    columns = {k: [r.get(k) for r in rows] for k in {k for r in rows for k in r}}
+    scores = compiled.score(columns)
+    for j, name in enumerate(compiled.names):
+        single = engine.score_records(name, columns)
+        np.testing.assert_allclose(scores.index[:, j], single.index, rtol=1e-12, atol=1e-12)
+        np.testing.assert_array_equal(scores.label[:, j], single.label)
@@ -0,0 +1,79 @@
+from itertools import combinations
+from math import factorial
+
+import numpy as np
+import pytest
+
+from omm import explain as shap
+from omm.models import TREATMENT_FORESTS, load_forest, load_vpch
+
+FORESTS = {
+    "vpch_surg": lambda: load_vpch("surg"),
+    "vpch_obs": lambda: load_vpch("obs"),
+    **{f"treatment_{k}": (lambda d=d: load_forest(d)) for k, d in TREATMENT_FORESTS.items()},
+}
+
+
+@pytest.fixture(scope="module", params=sorted(FORESTS))
+def forest(request):
+    return FORESTS[request.param]()
+
+
+def rows(forest, n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 4, (n, forest.n_features)).astype(np.float64) + rng.random((n, forest.n_features))
+
+
+def test_attributions_add_up_to_the_prediction(forest):
+    X = rows(forest)
+    for column in (0, 1):
+        e = shap.explain(forest, X, column)
+        np.testing.assert_allclose(e.base + e.values.sum(axis=1), forest.predict_proba(X)[:, column],
+                                   rtol=0, atol=1e-10)
+
+
+def test_unused_features_get_no_attribution(forest):
+    split = forest.left != np.arange(len(forest.left))
+    unused = np.setdiff1d(np.arange(forest.n_features), forest.feature[split])
+    e = shap.explain(forest, rows(forest, n=50, seed=1))
+    assert np.all(e.values[:, unused] == 0.0)
+
+
+def test_row_by_row_fallback_matches_table(forest, monkeypatch):
+    X = rows(forest, n=20, seed=2)
+    table = shap.explain(forest, X).values
+    monkeypatch.setattr(shap, "MAX_TABLE_DEPTH", 2)
+    np.testing.assert_allclose(shap.explain(forest, X).values, table, rtol=0, atol=1e-12)
+    with pytest.raises(ValueError, match="MAX_TABLE_DEPTH"):
+        shap.games.__wrapped__(forest)
+
+
+def _conditional(forest, x, coalition, node):
+    """E[f(x) | features in coalition], the others integrated out along the training covers."""
+    left, right = forest.left[node], forest.right[node]
+    if left == node:
+        return forest.value[node, 1]
+    if forest.feature[node] in coalition:
+        go_left = np.float32(x[forest.feature[node]]) <= forest.threshold32[node]
+        return _conditional(forest, x, coalition, left if go_left else right)
+    return (forest.cover[left] * _conditional(forest, x, coalition, left)
+            + forest.cover[right] * _conditional(forest, x, coalition, right)) / forest.cover[node]
+
+
+def test_matches_brute_force_shapley_values():
+    from sklearn.ensemble import RandomForestClassifier
+
+    from omm.forest import FlatForest
+
+    rng = np.random.default_rng(3)
+    X = rng.random((300, 4))
+    y = (X[:, 0] + 0.5 * X[:, 1] * X[:, 2] + 0.1 * rng.standard_normal(300) > 0.7).astype(int)
+    forest = FlatForest.from_sklearn(RandomForestClassifier(n_estimators=5, max_depth=4, random_state=0).fit(X, y))
+    players = range(4)
+    for x in X[:5]:
+        def v(coalition):
+            return np.mean([_conditional(forest, x, set(coalition), root) for root in forest.roots])
+        expected = [sum(factorial(k) * factorial(3 - k) / factorial(4) * (v(s + (j,)) - v(s))
+                        for k in range(4) for s in combinations([p for p in players if p != j], k))
+                    for j in players]
+        np.testing.assert_allclose(shap.explain(forest, x).values[0], expected, rtol=0, atol=1e-12)
@@ -0,0 +1,94 @@
+import joblib
+import numpy as np
+import pytest
+
+from omm import store
+from omm.forest import LEVEL, FlatForest
+from omm.models import ROOT
+
+SKLEARN = {
+    "vpch_surg": lambda: joblib.load(ROOT / "vpch/model_surg.pkl"),
+    "vpch_obs": lambda: joblib.load(ROOT / "vpch/model_obs.pkl"),
+    "treatment_surg": lambda: joblib.load(ROOT / "data/models.pkl")["clf_surg"],
+    "treatment_wait": lambda: joblib.load(ROOT / "data/models.pkl")["clf_wait"],
+}
+
+
+@pytest.fixture(scope="module", params=sorted(SKLEARN))
+def sklearn_forest(request):
+    return SKLEARN[request.param]()
+
+
+def rows(forest: FlatForest, n: int = 300, seed: int = 0) -> np.ndarray:
+    """Random rows whose values sit exactly on split thresholds half of the time."""
+    rng = np.random.default_rng(seed)
+    split = forest.left != np.arange(len(forest.left))
+    X = rng.uniform(-1.0, 10.0, (n, forest.n_features))
+    for j in range(forest.n_features):
+        t = forest.threshold[split & (forest.feature == j)]
+        if len(t):
+            on = rng.random(n) < 0.5
+            X[on, j] = rng.choice(t, on.sum())
+    return X
+
+
+def test_flat_forest_matches_sklearn(sklearn_forest):
+    flat = FlatForest.from_sklearn(sklearn_forest)
+    X = rows(flat)
+    np.testing.assert_allclose(flat.predict_proba(X), sklearn_forest.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(flat.apply(X), sklearn_forest.apply(X.astype(np.float32)) + flat.roots)
+
+
+def test_flat_forest_single_row_and_chunks(sklearn_forest):
+    flat = FlatForest.from_sklearn(sklearn_forest)
+    X = rows(flat, n=1000, seed=1)  # several CHUNK_ROWS chunks
+    full = flat.predict_proba(X)
+    np.testing.assert_allclose(full, sklearn_forest.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(flat.predict_proba(X[7]), full[7:8])
+
+
+def test_store_round_trip(sklearn_forest, tmp_path):
+    flat = FlatForest.from_sklearn(sklearn_forest)
+    store.export(flat, tmp_path / "forest")
+    X = rows(flat, seed=2)
+    for mmap in (True, False):
+        mapped = store.open_forest(tmp_path / "forest", mmap=mmap)
+        np.testing.assert_array_equal(mapped.predict_proba(X), flat.predict_proba(X))
+
+
+@pytest.mark.parametrize("directory", sorted(store.FORESTS))
+def test_shipped_stores_match_their_source(directory):
+    source, key = store.FORESTS[directory]
+    est = joblib.load(ROOT / source)
+    est = est if key is None else est[key]
+    mapped = store.open_forest(ROOT / directory)
+    X = rows(mapped, seed=3)
+    np.testing.assert_allclose(mapped.predict_proba(X), est.predict_proba(X), rtol=0, atol=1e-12)
+
+
+def test_forest_group_matches_members():
+    from omm.forest import ForestGroup
+    from omm.models import TREATMENT_FORESTS, load_forest
+
+    members = {k: load_forest(d) for k, d in TREATMENT_FORESTS.items()}
+    group = ForestGroup(members)
+    X = rows(members["surg"], n=500, seed=4)
+    expected = np.column_stack([f.predict_proba(X)[:, 1] for f in members.values()])
+    np.testing.assert_allclose(group.predict_proba(X), expected, rtol=0, atol=1e-12)
+    assert group.predict_one(X[0]) == pytest.approx(tuple(expected[0]), abs=1e-12)
+    summary = group.predict_summary(X)
+    for j, f in enumerate(members.values()):
+        for a, b in zip(summary, f.predict_summary(X)):
+            np.testing.assert_allclose(a[:, j], b, rtol=0, atol=1e-12)
+
+
+def test_tree_summary_matches_per_tree_probabilities(sklearn_forest):
+    flat = FlatForest.from_sklearn(sklearn_forest)
+    X = rows(flat, seed=5)
+    per_tree = np.column_stack([t.predict_proba(X.astype(np.float32))[:, 1] for t in sklearn_forest.estimators_])
+    s = flat.predict_summary(X)
+    np.testing.assert_allclose(s.mean, sklearn_forest.predict_proba(X)[:, 1], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(s.std, per_tree.std(axis=1), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(np.column_stack([s.low, s.high]),
+                               np.quantile(per_tree, [(1 - LEVEL) / 2, (1 + LEVEL) / 2], axis=1).T, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(s.votes, (per_tree > 0.5).mean(axis=1), rtol=0, atol=1e-12)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from starlette.testclient import TestClient
+
+from omm import engine, models
+from omm.service import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def test_lists_every_calculator(client):
+    listed = client.get("/calculators").json()
+    assert set(listed) == set(engine.CALCULATORS) | set(models.NAMES)
+
+
+def test_formula_matches_evaluate(client, records):
+    spec = engine.get("placenta")
+    rows = records(spec, n=5)
+    results = client.post("/predict_batch/placenta", json={"rows": rows}).json()["results"]
+    for row, res in zip(rows, results):
+        expected = spec.evaluate(row)
+        assert res["index"] == pytest.approx(expected.index)
+        assert res["label"] == expected.label
+
+
+def test_model_matches_forest(client):
+    features = models.get("vpch_surg").features
+    row = {f: 1.0 for f in features[:10]}
+    res = client.post("/predict/vpch_surg", json=row).json()
+    p = models.flat("vpch_surg").predict_proba(models.layout("vpch_surg").matrix([row]))[0, 1]
+    assert res["probability"] == pytest.approx(p, abs=1e-12)
+    assert res["label"] == int(p >= 0.5)
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/predict/placenta", "not json"),
+    ("/predict/placenta", [1, 2]),
+    ("/predict/placenta", {"no_such_field": 1}),
+    ("/predict/placenta", {"cervix_len_mm": "abc"}),
+    ("/predict_batch/placenta", {"rows": "x"}),
+    ("/predict_batch/placenta", {"rows": [1]}),
+    ("/predict/vpch_surg", {"no_such_field": 1}),
+    ("/predict/vpch_surg", {models.get("vpch_surg").features[0]: "abc"}),
+])
+def test_bad_input_is_400(client, path, body):
+    kwargs = {"content": body} if isinstance(body, str) else {"json": body}
+    res = client.post(path, **kwargs)
+    assert res.status_code == 400
+    assert "detail" in res.json()
+
+
+def test_unknown_calculator_is_404(client):
+    assert client.post("/predict/no_such_calculator", json={}).status_code == 404
+
+
+def test_single_rows_match_the_batch_scores(client):
+    features = models.get("vpch_obs").features
+    rows = [{features[0]: float(i % 3)} for i in range(20)]
+    results = [client.post("/predict/vpch_obs", json=r).json()["probability"] for r in rows]
+    expected = models.flat("vpch_obs").predict_proba(models.layout("vpch_obs").matrix(rows))[:, 1]
+    np.testing.assert_allclose(results, expected, rtol=0, atol=1e-12)
+    assert client.get("/stats").json()["vpch_obs"]["rows"] >= len(rows)
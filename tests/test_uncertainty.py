@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from omm.boundary import solve
+from omm.spec import load
+from omm.uncertainty import propagate
+
+
+def _record(spec, **values):
+    record = {name: 0 for name, meta in spec.inputs.items() if meta.get("kind") == "binary"}
+    return dict(record, **values)
+
+
+def test_zero_noise_reproduces_the_verdict():
+    spec = load("sfft")
+    record = _record(spec, ktr1=60.0, ktr2=55.0)
+    u = propagate(spec, record, {"ktr1": 1e-12}, n=1000)
+    expected = spec.evaluate(record)
+    assert u.verdicts[expected.label] == 1.0
+    assert u.interval == pytest.approx((expected.index, expected.index), abs=1e-9)
+
+
+def test_shares_match_the_scalar_evaluation_of_the_samples():
+    spec = load("sfft")
+    record = _record(spec, ktr1=60.0, ktr2=55.0)
+    record["ktr1"] = solve(spec, "ktr1", record)[0].value  # on the threshold: both verdicts occur
+    sd = {"ktr1": 2.0, "ktr2": 2.0}
+    u = propagate(spec, record, sd, n=2000, seed=7)
+    rng = np.random.default_rng(7)
+    draws = {k: record[k] + s * rng.standard_normal(2000) for k, s in sd.items()}
+    labels = [spec.evaluate(dict(record, ktr1=a, ktr2=b)).label for a, b in zip(draws["ktr1"], draws["ktr2"])]
+    assert u.verdicts == pytest.approx(tuple(np.bincount(labels, minlength=len(spec.labels)) / 2000))
+    assert min(u.verdicts) > 0.1 and sum(u.verdicts) == pytest.approx(1.0)
+
+
+def test_incomplete_record_is_rejected():
+    spec = load("sfft")
+    with pytest.raises(ValueError, match="incomplete record"):
+        propagate(spec, {"ktr1": 60.0, "ktr2": 55.0}, {"ktr1": 1.5})
+    with pytest.raises(ValueError, match="unknown inputs"):
+        propagate(spec, _record(spec, ktr1=60.0, ktr2=55.0), {"no_such_input": 1.0})
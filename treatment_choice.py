@@ -1,41 +1,68 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import joblib
 import plotly.graph_objects as go
 import warnings
 warnings.filterwarnings("ignore")
 
-MODELS_PATH = "data/models.pkl"
+from omm import dependence
+from omm.cache import PREDICTIONS, model_version
+from omm.explain import explain, figure as attribution_chart
+from omm.forest import TreeSummary
+from omm.lazy import lazy_import
+from omm.models import ROOT, TREATMENT_FORESTS, load_treatment
+
+# Only the full importance table needs pandas, and it is drawn on request
+pd = lazy_import("pandas")
+
 TOP_N_FEATURES = 20
 
 
 @st.cache_resource
 def load_models():
-    return joblib.load(MODELS_PATH)
+    # data/models_serving.pkl, exported from data/models.pkl by `python -m omm.treatment`
+    return load_treatment()
+
+
+@st.cache_resource
+def load_dependence():
+    """Grids of the top features, their population PD curves [(G, 2) surg/wait] and the cohort size, precomputed at export."""
+    pd_curves = load_models()["dependence"]
+    grids = [dependence.Grid(d["column"], np.asarray(d["grid"])) for d in pd_curves["curves"]]
+    return grids, [np.asarray(d["curve"]) for d in pd_curves["curves"]], pd_curves["rows"]
 
 
 def make_prediction(models, feature_values: dict):
-    """Return (p_surg, p_wait) given dict {feature_name: value}."""
+    """Return the per-tree summary (omm.forest.TreeSummary) given dict {feature_name: value}.
+
+    Every field is a length-2 array [surg, wait]; ``mean`` is (p_surg, p_wait).
+    """
     names = models["feature_names"]
     x = np.array([feature_values.get(n, 0.0) for n in names]).reshape(1, -1)
-    p_surg = models["clf_surg"].predict_proba(x)[0][1]
-    p_wait = models["clf_wait"].predict_proba(x)[0][1]
-    return p_surg, p_wait
+
+    def predict():
+        # both forests in one pass; the per-tree spread comes from the same leaves
+        summary = models["pair"].predict_summary(x)
+        return TreeSummary(*(field[0] for field in summary))
+
+    # Repeated inputs (reruns, re-submits) are answered from the process-wide cache
+    version = model_version(*(ROOT / d for d in TREATMENT_FORESTS.values()))
+    return PREDICTIONS.get_or_compute(version, x, predict)
 
 
-def prob_bar_chart(p_surg, p_wait):
+def prob_bar_chart(summary):
     fig = go.Figure()
     colors = ["#2196F3", "#4CAF50"]
     labels = ["Хирургическое лечение", "Выжидательная тактика"]
-    values = [p_surg, p_wait]
-    for i, (lbl, val, col) in enumerate(zip(labels, values, colors)):
+    for lbl, val, low, high, col in zip(labels, summary.mean, summary.low, summary.high, colors):
         fig.add_trace(go.Bar(
             x=[lbl], y=[val * 100],
             marker_color=col,
             text=[f"{val*100:.1f}%"],
             textposition="outside",
             name=lbl,
+            # 95% of the trees' own probabilities
+            error_y=dict(type="data", symmetric=False, array=[(high - val) * 100],
+                         arrayminus=[(val - low) * 100], color="#555"),
         ))
     fig.update_layout(
         yaxis=dict(range=[0, 110], title="Вероятность успешного исхода (%)"),
@@ -49,8 +76,10 @@ def prob_bar_chart(p_surg, p_wait):
 
 def importance_chart(models):
     top = models["top_features"]
-    imp_s = [models["imp_surg"][f] for f in top]
-    imp_w = [models["imp_wait"][f] for f in top]
+    imp_surg = dict(zip(models["feature_names"], models["imp_surg"]))
+    imp_wait = dict(zip(models["feature_names"], models["imp_wait"]))
+    imp_s = [imp_surg[f] for f in top]
+    imp_w = [imp_wait[f] for f in top]
     short = [str(f)[:40] for f in top]
 
     fig = go.Figure()
@@ -92,54 +121,50 @@ with tabs[0]:
         "Для остальных признаков используются нулевые значения."
     )
 
-    top_feats = models["top_features"]
-    # Determine feature range hints from training data
-    surg_df_feat = pd.DataFrame(models["X_surg"], columns=models["feature_names"])
-    wait_df_feat = pd.DataFrame(models["X_wait"], columns=models["feature_names"])
-    combined_df = pd.concat([surg_df_feat, wait_df_feat])
+    # Widget kinds and ranges of the top features, precomputed from training data
+    widgets = models["widgets"]
 
     input_vals = {}
     cols_per_row = 4
-    feat_groups = [top_feats[i:i+cols_per_row] for i in range(0, len(top_feats), cols_per_row)]
+    feat_groups = [widgets[i:i+cols_per_row] for i in range(0, len(widgets), cols_per_row)]
 
     for group in feat_groups:
         cols = st.columns(len(group))
-        for col_widget, feat in zip(cols, group):
-            feat_data = combined_df[feat].dropna()
-            mn, mx = float(feat_data.min()), float(feat_data.max())
-            med = float(feat_data.median())
-            unique_vals = sorted(feat_data.unique())
+        for col_widget, w in zip(cols, group):
+            feat = w["name"]
             label = str(feat)[:35]
 
             with col_widget:
-                if set(unique_vals).issubset({0.0, 1.0}):
+                if w["kind"] == "binary":
                     # Binary feature → selectbox
                     choice = st.selectbox(label, options=[0, 1],
                                           format_func=lambda v: "Нет (0)" if v == 0 else "Да (1)",
                                           key=feat)
                     input_vals[feat] = float(choice)
-                elif mx - mn <= 10 and len(unique_vals) <= 10:
+                elif w["kind"] == "discrete":
                     # Few discrete values
-                    choice = st.selectbox(label, options=[float(v) for v in unique_vals], key=feat)
+                    choice = st.selectbox(label, options=w["values"], key=feat)
                     input_vals[feat] = choice
                 else:
                     # Continuous
-                    val = st.number_input(label, min_value=float(mn), max_value=float(mx),
-                                          value=float(med), step=float(max((mx-mn)/100, 0.1)),
-                                          key=feat)
+                    val = st.number_input(label, min_value=w["min"], max_value=w["max"],
+                                          value=w["median"], step=w["step"], key=feat)
                     input_vals[feat] = val
 
     st.divider()
 
     if st.button("🔮 Получить рекомендацию", type="primary", use_container_width=True):
         full_input = {feat: input_vals.get(feat, 0.0) for feat in models["feature_names"]}
-        p_surg, p_wait = make_prediction(models, full_input)
+        summary = make_prediction(models, full_input)
+        st.session_state["treatment_patient"] = full_input
+        p_surg, p_wait = summary.mean
 
         st.subheader("Результат")
         res_col1, res_col2 = st.columns([2, 1])
 
         with res_col1:
-            st.plotly_chart(prob_bar_chart(p_surg, p_wait), use_container_width=True)
+            st.plotly_chart(prob_bar_chart(summary), use_container_width=True)
+            st.caption("Отрезки — интервал, в который попадают 95% прогнозов отдельных деревьев леса.")
 
         with res_col2:
             diff = abs(p_surg - p_wait)
@@ -156,6 +181,9 @@ with tabs[0]:
             st.write(f"**Уверенность:** {confidence}")
             st.write(f"Вероятность успеха при {better}: **{bp*100:.1f}%**")
             st.write(f"Вероятность успеха при {worse}: **{wp*100:.1f}%**")
+            votes_surg, votes_wait = summary.votes
+            st.write(f"Деревья, прогнозирующие успех: хирургия — **{votes_surg:.0%}**, "
+                     f"выжидание — **{votes_wait:.0%}**")
 
             if diff < 0.1:
                 st.warning("⚠️ Разница невелика. Рекомендуется дополнительная клиническая оценка.")
@@ -168,10 +196,39 @@ with tabs[1]:
     st.subheader(f"Топ-{TOP_N_FEATURES} важных признаков")
     st.plotly_chart(importance_chart(models), use_container_width=True)
 
+    st.subheader("Вклад признаков в прогноз для пациента")
+    if "treatment_patient" in st.session_state:
+        x = np.array([[st.session_state["treatment_patient"][n] for n in models["feature_names"]]])
+        cols = st.columns(2)
+        for col, key, title in zip(cols, ("surg", "wait"), ("Хирургическое лечение", "Выжидательная тактика")):
+            e = explain(models["forests"][key], x)
+            col.plotly_chart(attribution_chart(models["feature_names"], e.values[0], title=title),
+                             use_container_width=True)
+            col.caption(f"Средняя вероятность успеха {e.base:.1%} → прогноз {e.base + e.values[0].sum():.1%}")
+        st.caption("TreeSHAP: красный — признак повышает вероятность успеха, синий — понижает.")
+    else:
+        st.caption("Получите рекомендацию на первой вкладке, чтобы увидеть вклад признаков для пациента.")
+
+    st.subheader("Зависимость прогноза от признака")
+    grids, population, cohort = load_dependence()
+    k = st.selectbox("Признак", range(len(grids)), format_func=lambda i: models["top_features"][i], key="treatment_pdp_feature")
+    curves = {"Хирургия — в среднем по выборке": (population[k][:, 0], "dash", "#2196F3"),
+              "Выжидание — в среднем по выборке": (population[k][:, 1], "dash", "#4CAF50")}
+    if "treatment_patient" in st.session_state:
+        x = np.array([st.session_state["treatment_patient"][n] for n in models["feature_names"]])
+        patient = dependence.ice(models["pair"], x, grids)[k]  # all top features, both forests: one batch
+        curves["Хирургия — пациент"] = (patient[:, 0], "solid", "#2196F3")
+        curves["Выжидание — пациент"] = (patient[:, 1], "solid", "#4CAF50")
+    st.plotly_chart(dependence.figure(grids[k].values, curves, models["top_features"][k],
+                                      discrete=len(grids[k].values) <= 10), use_container_width=True)
+    st.caption(f"Пунктир — частичная зависимость (среднее по {cohort} пациентам обучающей выборки), "
+               "сплошная линия — кривая ICE пациента: прогноз при изменении только этого признака.")
+
     st.subheader("Все важности признаков")
-    imp_df = pd.DataFrame({
-        "Признак": models["feature_names"],
-        "Важность (хирургия)": models["imp_surg"].values,
-        "Важность (выжидание)": models["imp_wait"].values,
-    }).sort_values("Важность (хирургия)", ascending=False).reset_index(drop=True)
-    st.dataframe(imp_df, use_container_width=True, height=400)
+    if st.checkbox("Показать таблицу", key="treatment_all_importances"):
+        imp_df = pd.DataFrame({
+            "Признак": models["feature_names"],
+            "Важность (хирургия)": models["imp_surg"],
+            "Важность (выжидание)": models["imp_wait"],
+        }).sort_values("Важность (хирургия)", ascending=False).reset_index(drop=True)
+        st.dataframe(imp_df, use_container_width=True, height=400)
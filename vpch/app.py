@@ -1,9 +1,27 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
+import io
 import json
-import plotly.express as px
+import os
+import sys
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# `streamlit run vpch/app.py` puts vpch/ on the path, not the repository root that holds omm;
+# the page reruns on every interaction, so add it only once
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from omm import dependence
+from omm.cache import PREDICTIONS, model_version
+from omm.explain import explain, figure as attribution_chart
+from omm.forest import TreeSummary
+from omm.layout import FeatureLayout
+from omm.lazy import lazy_import
+from omm.store import open_forest
+
+# Only the cohort tab needs pandas (through omm.stream), and only once a file is uploaded
+stream = lazy_import("omm.stream")
 
 st.set_page_config(
     page_title="ВПЧ — Прогноз исходов",
@@ -13,19 +31,22 @@ st.set_page_config(
 
 # ── Load artefacts ───────────────────────────────────────────────────────────
 @st.cache_resource
-def load_all_models():
-    models = {
-        "surg": joblib.load("./vpch/model_surg.pkl"),  # plain RandomForestClassifier
-        "obs":  joblib.load("./vpch/model_obs.pkl"),
-    }
+def load_model(group):
+    # Reads the store manifest only; the arrays are memory-mapped on the first
+    # prediction, so the group that is never selected costs no load time.
+    return open_forest(f"./vpch/forest_{group}")
+
+
+@st.cache_resource
+def load_metadata():
     with open("./vpch/feature_cols.json", encoding="utf-8") as f:
         cols = json.load(f)
     with open("./vpch/feature_importances.json", encoding="utf-8") as f:
         fi = json.load(f)
-    return models, cols, fi  # models are plain RandomForestClassifier objects
+    return cols, fi, FeatureLayout(cols)
 
 
-ALL_MODELS, feature_cols, fi_data = load_all_models()
+feature_cols, fi_data, LAYOUT = load_metadata()
 
 # ── Feature metadata ─────────────────────────────────────────────────────────
 HPV_HR = ["ВПЧ ВКР 16 ", "ВПЧ 18", "ВПЧ 31", "ВПЧ 33", "ВПЧ 35",
@@ -101,85 +122,122 @@ GROUP_LABEL = {"surg": "Хирургическая", "obs": "Наблюдате
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
-def collect_inputs():
-    values = {}
+def collect_inputs(x):
+    """Widgets write straight into ``x``, the (1, n) input vector in ``feature_cols`` order."""
+    row, at = x[0], LAYOUT.index
 
     with st.expander("🦠 ВПЧ высокого риска (ВКР)", expanded=True):
         cols = st.columns(5)
         for i, c in enumerate(HPV_HR):
-            values[c] = int(cols[i % 5].checkbox(c.strip(), key=f"hpv_{i}"))
+            row[at[c]] = int(cols[i % 5].checkbox(c.strip(), key=f"hpv_{i}"))
 
     with st.expander("🦠 ВПЧ низкого риска (НКР) + количество типов"):
         cols = st.columns(3)
-        values[HPV_COUNT[0]] = cols[0].number_input(
+        row[at[HPV_COUNT[0]]] = cols[0].number_input(
             "Кол-во типов ВПЧ", min_value=0, max_value=16, value=1, step=1)
         for i, c in enumerate(HPV_LR):
-            values[c] = int(cols[(i + 1) % 3].checkbox(c.strip(), key=f"lr_{i}"))
+            row[at[c]] = int(cols[(i + 1) % 3].checkbox(c.strip(), key=f"lr_{i}"))
 
     with st.expander("🔬 Микробиом влагалища (log₁₀ концентрация)"):
         cols = st.columns(3)
         for i, c in enumerate(MICROBIOME):
             short = c.split("+")[0].split(".")[0][:30]
             mn, mx, default = CONTINUOUS[c]
-            values[c] = cols[i % 3].number_input(
+            row[at[c]] = cols[i % 3].number_input(
                 short, min_value=float(mn), max_value=float(mx),
                 value=float(default), step=0.1, key=f"mb_{i}")
 
     with st.expander("🔬 Лактобациллы"):
         c1, c2 = st.columns(2)
         mn, mx, default = CONTINUOUS[LACTOBAC[0]]
-        values[LACTOBAC[0]] = c1.number_input(
+        row[at[LACTOBAC[0]]] = c1.number_input(
             "Lactobac. spp. % (относительный)",
             min_value=float(mn), max_value=float(mx),
             value=float(default), step=0.1)
-        values[LACTOBAC[1]] = int(c2.checkbox("Lactobac. spp. Снижено"))
+        row[at[LACTOBAC[1]]] = int(c2.checkbox("Lactobac. spp. Снижено"))
 
     with st.expander("🔬 Цитология"):
         cols = st.columns(3)
         for i, c in enumerate(CYTOLOGY):
-            values[c] = int(cols[i % 3].checkbox(c[:40], key=f"cy_{i}"))
+            row[at[c]] = int(cols[i % 3].checkbox(c[:40], key=f"cy_{i}"))
 
     with st.expander("🔬 Кольпоскопия"):
         cols = st.columns(4)
         for i, c in enumerate(COLPOSCOPY):
-            values[c] = int(cols[i % 4].checkbox(c.strip()[:35], key=f"co_{i}"))
+            row[at[c]] = int(cols[i % 4].checkbox(c.strip()[:35], key=f"co_{i}"))
 
     with st.expander("👤 Демография и анамнез", expanded=True):
         c1, c2 = st.columns(2)
-        values["Возраст"] = c1.number_input("Возраст (лет)", 18, 60, 30)
-        values["ИМТ"] = c2.number_input("ИМТ", 15.0, 45.0, 24.0, step=0.1)
-        values["возраст начала половой жизни"] = c1.number_input(
+        row[at["Возраст"]] = c1.number_input("Возраст (лет)", 18, 60, 30)
+        row[at["ИМТ"]] = c2.number_input("ИМТ", 15.0, 45.0, 24.0, step=0.1)
+        row[at["возраст начала половой жизни"]] = c1.number_input(
             "Возраст начала половой жизни", 12, 30, 17)
-        values["Возраст Менархе"] = c2.number_input("Возраст менархе", 9, 18, 13)
-        values["Пролжительность менструации"] = c1.number_input(
+        row[at["Возраст Менархе"]] = c2.number_input("Возраст менархе", 9, 18, 13)
+        row[at["Пролжительность менструации"]] = c1.number_input(
             "Длительность менструации (дни)", 1, 14, 6)
 
         st.markdown("**Сопутствующие заболевания и анамнез**")
         cols = st.columns(3)
         for i, c in enumerate(DEMO_BINARY):
-            values[c] = int(cols[i % 3].checkbox(DEMO_LABELS[c], key=f"dm_{i}"))
+            row[at[c]] = int(cols[i % 3].checkbox(DEMO_LABELS[c], key=f"dm_{i}"))
+
+    return x
 
-    return values
+
+@st.cache_resource
+def load_dependence(group):
+    """Top-20 features of the group, their grids and PD curves from the trees' training covers."""
+    fi = fi_data[group]
+    names = sorted(fi, key=fi.get, reverse=True)[:20]
+    grids = [dependence.Grid(LAYOUT.index[n], dependence.grid("continuous", *CONTINUOUS[n][:2])
+                             if n in CONTINUOUS else dependence.grid("binary"))
+             for n in names]
+    return names, grids, dependence.cover_dependence(load_model(group), grids)
 
 
 def fi_chart(fi_key, title=""):
     fi = fi_data[fi_key]
-    fi_df = (
-        pd.DataFrame({"Признак": list(fi.keys()), "Важность": list(fi.values())})
-        .sort_values("Важность", ascending=False)
-        .head(20)
-    )
-    fig = px.bar(
-        fi_df[::-1], x="Важность", y="Признак", orientation="h",
-        title=title, color="Важность", color_continuous_scale="Blues",
-    )
+    names = np.array(list(fi.keys()), dtype=object)
+    values = np.array(list(fi.values()), dtype=np.float64)
+    top = np.argsort(-values, kind="stable")[:20][::-1]  # top 20, largest at the top of the chart
+    fig = go.Figure(go.Bar(
+        x=values[top], y=names[top], orientation="h",
+        marker=dict(color=values[top], colorscale="Blues"),
+    ))
     fig.update_layout(
-        height=550, coloraxis_showscale=False,
+        title=title, height=550, xaxis_title="Важность",
         margin=dict(l=10, r=10, t=40, b=10), yaxis_title="",
     )
     return fig
 
 
+def score_cohort(upload, progress):
+    """Score a CSV/Parquet cohort chunk by chunk with both forests; returns (file bytes, rows, missing cols)."""
+    fmt = stream.file_format(upload)
+    out = io.BytesIO()
+    columns = buf = None
+    with stream.ChunkWriter(out, fmt=fmt) as writer:
+        for chunk, done in stream.read_chunks(upload, fmt):
+            if columns is None:
+                columns = stream.match_columns(chunk, feature_cols)
+                passthrough = [c for c in chunk.columns if c not in set(columns.values())]
+            if buf is None or len(buf) < len(chunk):
+                buf = np.empty((len(chunk), len(LAYOUT)))
+            X = stream.model_matrix(chunk, feature_cols, columns, out=buf)  # one buffer for every chunk
+            res = chunk[passthrough].reset_index(drop=True)
+            for key in GROUP_LABEL:
+                s = load_model(key).predict_summary(X)  # one descent: mean, tree interval and votes
+                res[f"p_{key}"] = s.mean
+                res[f"outcome_{key}"] = (s.mean >= 0.5).astype(int)
+                res[f"p_{key}_low"] = s.low
+                res[f"p_{key}_high"] = s.high
+                res[f"votes_{key}"] = s.votes
+            writer.write(res)
+            progress.progress(done, text=f"Обработано строк: {writer.rows:,}")
+    missing = [c for c in feature_cols if c not in (columns or {})]
+    return out.getvalue(), writer.rows, missing
+
+
 # ── Page ─────────────────────────────────────────────────────────────────────
 st.title("🔬 Прогноз исходов лечения ВПЧ-ассоциированных поражений шейки матки")
 
@@ -193,25 +251,79 @@ group_key = st.radio(
 st.markdown(f"*Используются модели, обученные на группе: **{GROUP_LABEL[group_key]}***")
 st.divider()
 
-tab_pred, tab_fi = st.tabs(["🎯 Прогноз", "📊 Важность признаков"])
+tab_pred, tab_batch, tab_fi = st.tabs(["🎯 Прогноз", "📂 Когорта (CSV / Parquet)", "📊 Важность признаков"])
 
 # ── Tab 1: Prediction ────────────────────────────────────────────────────────
 with tab_pred:
     with st.form("patient_form"):
-        inputs = collect_inputs()
+        x = collect_inputs(LAYOUT.row())
         submitted = st.form_submit_button("🔮 Рассчитать прогноз", type="primary")
 
     if submitted:
-        rf  = ALL_MODELS[group_key]
-        row = pd.DataFrame([{c: inputs.get(c, 0) for c in feature_cols}])[feature_cols]
-        p   = rf.predict_proba(row.values)[0][1]
+        rf  = load_model(group_key)
+        # Repeated inputs (reruns, re-submits) are answered from the process-wide cache
+        s   = PREDICTIONS.get_or_compute(model_version(f"./vpch/forest_{group_key}"), x,
+                                         lambda: TreeSummary(*(float(f[0]) for f in rf.predict_summary(x))))
+        p   = s.mean
+        st.session_state["vpch_patient"] = x.copy()  # x is the reused input buffer; kept for the attributions tab
 
         st.markdown("---")
         label = "✅ Положительный исход" if p >= 0.5 else "❌ Отрицательный исход"
         st.markdown(f"## {label}")
+        st.markdown(f"Вероятность положительного исхода: **{p:.1%}** "
+                    f"(95% деревьев леса: {s.low:.0%}–{s.high:.0%}, разброс ±{s.std:.0%}). "
+                    f"За положительный исход голосуют **{s.votes:.0%}** деревьев.")
 
-# ── Tab 2: Feature Importance ────────────────────────────────────────────────
+# ── Tab 2: Cohort scoring ────────────────────────────────────────────────────
+with tab_batch:
+    st.markdown(
+        "Файл CSV или Parquet: по строке на пациентку, столбцы — признаки из `feature_cols.json`. "
+        "Отсутствующие признаки и пустые ячейки считаются равными 0, прочие столбцы "
+        "(например, идентификатор) переносятся в результат. Для каждой строки считаются "
+        "вероятности положительного исхода для обеих групп (`p_surg`, `p_obs`), интервал "
+        "прогнозов 95% деревьев (`p_<группа>_low`, `p_<группа>_high`) и доля деревьев, "
+        "голосующих за положительный исход (`votes_<группа>`)."
+    )
+    upload = st.file_uploader("Файл когорты", type=["csv", "parquet"])
+    if upload is not None and st.button("▶️ Рассчитать когорту", type="primary"):
+        data, rows, missing = score_cohort(upload, st.progress(0.0, text="Чтение файла..."))
+        st.session_state["cohort_result"] = (upload.name, data, rows, missing)
+
+    if "cohort_result" in st.session_state:
+        name, data, rows, missing = st.session_state["cohort_result"]
+        st.success(f"Рассчитано пациенток: {rows:,}")
+        if missing:
+            st.warning(f"В файле нет {len(missing)} признаков, они приняты равными 0: "
+                       + ", ".join(c.strip() for c in missing[:10]) + ("…" if len(missing) > 10 else ""))
+        base, ext = os.path.splitext(name)
+        st.download_button("⬇️ Скачать результаты", data=data, file_name=f"{base}_scored{ext}")
+
+# ── Tab 3: Feature Importance ────────────────────────────────────────────────
 with tab_fi:
     st.markdown(f"### Топ-20 важных признаков — группа: {GROUP_LABEL[group_key]}")
     st.plotly_chart(fi_chart(group_key, GROUP_LABEL[group_key]), use_container_width=True)
 
+    st.markdown("### Вклад признаков в прогноз для пациентки")
+    if "vpch_patient" in st.session_state:
+        e = explain(load_model(group_key), st.session_state["vpch_patient"])
+        st.plotly_chart(attribution_chart(feature_cols, e.values[0]), use_container_width=True)
+        st.caption(f"TreeSHAP: средняя вероятность по обучающей выборке {e.base:.1%}, "
+                   f"сумма вкладов {e.values[0].sum() * 100:+.1f} п.п. даёт прогноз "
+                   f"{e.base + e.values[0].sum():.1%}. Красный — признак повышает вероятность "
+                   f"положительного исхода, синий — понижает.")
+    else:
+        st.caption("Рассчитайте прогноз на вкладке «🎯 Прогноз», чтобы увидеть вклад признаков для пациентки.")
+
+    st.markdown("### Зависимость прогноза от признака")
+    names, grids, population = load_dependence(group_key)
+    k = st.selectbox("Признак", range(len(names)), format_func=lambda i: names[i].strip(), key="vpch_pdp_feature")
+    curves = {"В среднем по обучающей выборке": (population[k], "dash", "#1565C0")}
+    if "vpch_patient" in st.session_state:
+        # ICE of all top-20 features in one batch
+        curves["Пациентка"] = (dependence.ice(load_model(group_key), st.session_state["vpch_patient"], grids)[k],
+                               "solid", "#C62828")
+    st.plotly_chart(dependence.figure(grids[k].values, curves, names[k].strip(),
+                                      discrete=len(grids[k].values) <= 10), use_container_width=True)
+    st.caption("Пунктир — частичная зависимость по распределению обучающей выборки, записанному в деревьях "
+               "леса; сплошная линия — прогноз для пациентки при изменении только этого признака.")
+